@@ -0,0 +1,296 @@
+"""
+Benchmark of the analysis pipeline on synthetic experiment trees (see benchmarks.synthetic).
+
+For every scale and schema it times (median of --repeat runs) and memory-profiles (tracemalloc
+peak, in a separate run) these paths:
+
+    cpu_energy_csv   compute_cpu_energy_from_csv on every run's CSV
+    summary_csv      extract_and_append_summary parsing the CSVs (no binary traces, no cache)
+    summary_trace    extract_and_append_summary reading the binary traces
+    summary_cached   extract_and_append_summary with every run in the energy cache
+    aggregation      EnergyAggregates.invalidate of all experiments
+    extract_data     the bar and pie charts' _extract_data for every energy type
+    render_bar       drawing the bar chart (only with a display)
+    render_pie       drawing the pie chart (only with a display)
+
+The summary runs in-process (workers=1), so the profile covers all of its work.
+Results are appended with the current git commit to --output, so runs on different commits
+can be compared; --compare REV prints the ratios to the last results of that commit and
+fails if a path got slower than --max-slowdown.
+
+    python -m benchmarks.analysis [--scales small medium] [--schemas energy power] [--repeat 3]
+    python -m benchmarks.analysis --scales 50x20x1000 --compare HEAD~1
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from benchmarks.synthetic import SCHEMAS, generate_experiment
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join("results", "benchmarks", "analysis.jsonl")
+
+# tasks x runs x samples per run
+SCALES = {
+    "small": (5, 5, 500),
+    "medium": (20, 10, 2000),
+    "large": (30, 20, 2000),
+}
+ENERGY_TYPES = ("CPU Energy", "RAM Energy", "CPU Compensation", "Both")
+
+
+def parse_scale(name):
+    if name in SCALES:
+        return name, SCALES[name]
+    try:
+        tasks, runs, samples = (int(part) for part in name.split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"scale must be one of {', '.join(SCALES)} or TASKSxRUNSxSAMPLES")
+    return name, (tasks, runs, samples)
+
+
+def git_commit():
+    """
+    The short hash of HEAD, with a + when the working tree has uncommitted changes.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("+" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(function, setup=None, repeat=3):
+    """
+    Median and minimum wall time of function over repeat runs, and the peak memory it
+    allocated in one more run under tracemalloc. setup runs untimed before every run.
+    """
+    times = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"seconds": statistics.median(times), "min_seconds": min(times), "peak_mb": peak / 2**20}
+
+
+def remove_files(pattern):
+    for path in glob.glob(pattern, recursive=True):
+        os.remove(path)
+
+
+def benchmark_tree(experiment_dir, work_dir, repeat):
+    """
+    Run every benchmarked path on one experiment tree. Returns {case: measurement}.
+    """
+    # pandas and the charts are imported here, so generating trees doesn't pay for them
+    from gui.views.statistics.aggregation import EnergyAggregates
+    from gui.views.statistics.bar_chart import BarChart
+    from gui.views.statistics.pie_chart import PieChart
+    from logic.binary_trace import ensure_trace
+    from logic.experiment_summary import compute_cpu_energy_from_csv, extract_and_append_summary, list_run_folders
+    from logic.results_store import ResultsStore
+
+    store_path = os.path.join(work_dir, "experiments.sqlite")
+    cache_path = os.path.join(work_dir, "energy_cache.sqlite")
+    csv_files = [os.path.join(run_path, "results.csv") for _, _, run_path in list_run_folders(experiment_dir)]
+
+    def without_traces():
+        remove_files(os.path.join(experiment_dir, "**", "*.trace"))
+
+    def without_store():
+        remove_files(store_path + "*")
+
+    def summarize(cache=None):
+        return lambda: extract_and_append_summary(experiment_dir, store_path=store_path, workers=1, cache_path=cache)
+
+    results = {}
+    without_traces()
+    results["cpu_energy_csv"] = measure(lambda: [compute_cpu_energy_from_csv(path) for path in csv_files], repeat=repeat)
+    results["summary_csv"] = measure(summarize(), lambda: (without_traces(), without_store()), repeat)
+
+    for path in csv_files:
+        ensure_trace(path)
+    results["summary_trace"] = measure(summarize(), without_store, repeat)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        summarize(cache_path)()
+    results["summary_cached"] = measure(summarize(cache_path), without_store, repeat)
+
+    store = ResultsStore(store_path)
+    try:
+        experiments = store.experiments()
+        aggregates = EnergyAggregates(store)
+        results["aggregation"] = measure(lambda: EnergyAggregates(store).invalidate(experiments), repeat=repeat)
+        aggregates.invalidate(experiments)
+        results["extract_data"] = measure(lambda: extract_chart_data(BarChart, PieChart, aggregates, experiments),
+                                          aggregates._memo.clear, repeat)
+        results.update(benchmark_rendering(BarChart, PieChart, aggregates, experiments, repeat))
+    finally:
+        store.close()
+    return results
+
+
+def extract_chart_data(BarChart, PieChart, aggregates, experiments):
+    for energy_type in ENERGY_TYPES:
+        BarChart._extract_data(SimpleNamespace(aggregates=aggregates), experiments, energy_type)
+        chart = SimpleNamespace(aggregates=aggregates, energy_type=energy_type)
+        for experiment in experiments:
+            PieChart._extract_data(chart, experiment)
+
+
+def benchmark_rendering(BarChart, PieChart, aggregates, experiments, repeat):
+    """
+    Time drawing both charts, or nothing if there is no display.
+    """
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return {}
+
+    try:
+        bar_chart = BarChart(root, aggregates)
+        pie_chart = PieChart(root, aggregates)
+        bar_chart.refresh("CPU Energy", experiments, experiments)
+        pie_chart.refresh("CPU Energy", experiments, experiments)
+
+        def render(chart, canvas):
+            def draw():
+                for energy_type in ENERGY_TYPES:
+                    chart.update(energy_type)
+                    canvas.draw()
+            return draw
+
+        return {
+            "render_bar": measure(render(bar_chart, bar_chart.bar_canvas), repeat=repeat),
+            "render_pie": measure(render(pie_chart, pie_chart.pie_canvas), repeat=repeat),
+        }
+    finally:
+        root.destroy()
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline_results(records, revision, current_commit):
+    """
+    The latest result of every (scale, schema, case) of the given commit (a hash prefix or
+    a revision git understands); "previous" picks the latest other commit.
+    """
+    if revision == "previous":
+        commits = [r["commit"] for r in records if r["commit"] != current_commit]
+        if not commits:
+            return {}
+        commit = commits[-1]
+        matches = lambda r: r["commit"] == commit
+    else:
+        resolved = subprocess.run(["git", "rev-parse", "--short", revision], cwd=ROOT, capture_output=True, text=True)
+        prefix = resolved.stdout.strip() if resolved.returncode == 0 else revision
+        matches = lambda r: r["commit"].rstrip("+").startswith(prefix)
+    return {(r["scale"], r["schema"], r["case"]): r for r in records if matches(r)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", type=parse_scale, default=[parse_scale("small"), parse_scale("medium")],
+                        help=f"{', '.join(SCALES)} or TASKSxRUNSxSAMPLES (default: small medium)")
+    parser.add_argument("--schemas", nargs="+", choices=SCHEMAS, default=list(SCHEMAS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON-lines file the results are appended to")
+    parser.add_argument("--compare", nargs="?", const="previous", default=None,
+                        help="compare with the results of this commit (default: the previous one benchmarked)")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="fail if a path is this many times slower than in the compared commit")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output)
+    commit = git_commit()
+    records = []
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    for scale, (tasks, runs, samples) in args.scales:
+        for schema in args.schemas:
+            work_dir = tempfile.mkdtemp(prefix="energy-bench-")
+            cwd = os.getcwd()
+            try:
+                # The results store imports a legacy summary CSV relative to the working directory
+                os.chdir(work_dir)
+                start = time.perf_counter()
+                experiment_dir = generate_experiment(os.path.join(work_dir, "experiment_results"), f"bench_{schema}",
+                                                     tasks, runs, samples, schema)
+                print(f"{scale} ({tasks} tasks x {runs} runs x {samples} samples, {schema}): "
+                      f"generated in {time.perf_counter() - start:.1f} s")
+                for case, result in benchmark_tree(experiment_dir, work_dir, args.repeat).items():
+                    print(f"  {case:<16} {result['seconds'] * 1000:10.1f} ms  {result['peak_mb']:8.1f} MB peak")
+                    records.append({
+                        "commit": commit, "time": time.time(), "python": platform.python_version(),
+                        "scale": scale, "tasks": tasks, "runs": runs, "samples": samples, "schema": schema,
+                        "case": case, **result,
+                    })
+            finally:
+                os.chdir(cwd)
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    previous = load_results(output)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    print(f"Results appended to {output}")
+
+    if args.compare is None:
+        return 0
+    baseline = baseline_results(previous, args.compare, commit)
+    if not baseline:
+        print(f"No results of {args.compare} to compare with.")
+        return 0
+
+    failed = False
+    print(f"Compared with {next(iter(baseline.values()))['commit']}:")
+    for record in records:
+        old = baseline.get((record["scale"], record["schema"], record["case"]))
+        if old is None:
+            continue
+        ratio = record["seconds"] / old["seconds"] if old["seconds"] > 0 else float("inf")
+        status = "SLOWER" if ratio > args.max_slowdown else ""
+        failed |= bool(status)
+        print(f"  {record['scale']:<8} {record['schema']:<7} {record['case']:<16} {ratio:6.2f}x time  "
+              f"{record['peak_mb'] - old['peak_mb']:+8.1f} MB peak  {status}")
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
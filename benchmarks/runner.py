@@ -0,0 +1,198 @@
+"""
+End-to-end benchmark and regression test of the experiment runner, with the simulated
+EnergiBridge and Gradle of benchmarks.simulator.
+
+Runs the task discovery and a complete run_experiment (idle measurement, every task and
+iteration, cleaning, summary) without pauses or warmup. It then reports the wall time against
+the time the simulated commands themselves took, i.e. the runner's own overhead. It fails if
+the discovered tasks, the journal, the events or the stored summary are not what the
+configuration implies.
+
+    python -m benchmarks.runner [--tasks 5] [--iterations 3] [--task-duration 5] [--speed 20]
+                                [--single-build] [--schema energy] [--profile 25] [--compare REV]
+"""
+
+import argparse
+import cProfile
+import contextlib
+import io
+import json
+import os
+import pstats
+import queue
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.analysis import baseline_results, git_commit, load_results
+from benchmarks.simulator import DEFAULT_CONFIG, create_simulation
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join("results", "benchmarks", "runner.jsonl")
+
+
+def simulated_seconds(args):
+    """
+    Wall time the simulated commands of the experiment take by themselves.
+    """
+    from logic.experiment_setup import IDLE_SAMPLE_SECONDS
+
+    startup = DEFAULT_CONFIG["startup"]["duration"]
+    clean = DEFAULT_CONFIG["clean_duration"]
+    builds = 1 if args.single_build else args.tasks
+    per_iteration = builds * startup + args.tasks * args.task_duration + clean
+    return (IDLE_SAMPLE_SECONDS + clean + args.iterations * per_iteration) / args.speed
+
+
+def run_simulated_experiment(args, work_dir):
+    """
+    Run the experiment on a fresh simulation. Returns (experiment directory, events, discovered tasks).
+    """
+    from logic import experiment_setup
+    from logic.events import CallbackSink
+
+    tasks = {f":module{i % 3}:task{i}": {"duration": args.task_duration, "power": 20 + 5 * (i % 4)}
+             for i in range(args.tasks)}
+    project_dir, energibridge_path, bin_dir = create_simulation(
+        work_dir, tasks, speed=args.speed, schema=args.schema
+    )
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+    experiment_setup.set_gradle_repository_path(project_dir)
+    experiment_setup.set_energibridge_path(energibridge_path)
+    experiment_setup.set_measurement_backend(experiment_setup.ENERGIBRIDGE_BACKEND)
+
+    events = []
+    discovered = experiment_setup.get_tasks_cached("build", refresh=True)
+    experiment_dir = experiment_setup.run_experiment(
+        "simulated", args.iterations, 0, 0, False, discovered, queue.Queue(), single_build=args.single_build,
+        sink=CallbackSink(events.append), idle_max_age=0, idle_sample_interval=0,
+    )
+    return experiment_dir, events, list(tasks), discovered
+
+
+def check_experiment(args, experiment_dir, events, tasks, discovered):
+    """
+    Problems with the outcome of the simulated experiment, as messages.
+    """
+    from logic.journal import read_journal
+    from logic.results_store import ResultsStore
+
+    problems = []
+    if discovered != tasks:
+        problems.append(f"discovered {len(discovered)} tasks, expected {len(tasks)}")
+    if not read_journal(experiment_dir).completed:
+        problems.append("journal is not completed")
+
+    names = [event.name for event in events]
+    builds = 1 if args.single_build else len(tasks)
+    if names.count("task_finished") != builds * args.iterations:
+        problems.append(f"{names.count('task_finished')} task_finished events, expected {builds * args.iterations}")
+    if any(event.name == "task_finished" and event.returncode != 0 for event in events):
+        problems.append("a simulated task failed")
+    if "error" in names:
+        problems.append("error events: " + "; ".join(event.message for event in events if event.name == "error"))
+    if "experiment_finished" not in names:
+        problems.append("no experiment_finished event")
+
+    store = ResultsStore()
+    try:
+        rows = store.query([os.path.basename(experiment_dir)])
+    finally:
+        store.close()
+    if len(rows) != len(tasks) * args.iterations:
+        problems.append(f"{len(rows)} summary rows, expected {len(tasks) * args.iterations}")
+    elif (rows["CPU Energy"] <= 0).any():
+        problems.append("summary rows without CPU energy")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--task-duration", type=float, default=5.0, help="simulated seconds per task")
+    parser.add_argument("--speed", type=float, default=DEFAULT_CONFIG["speed"], help="simulated seconds per second")
+    parser.add_argument("--single-build", action="store_true")
+    parser.add_argument("--schema", choices=("energy", "power"), default="energy")
+    parser.add_argument("--profile", type=int, default=0, metavar="N", help="print the N functions with the most cumulative time")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON-lines file the results are appended to")
+    parser.add_argument("--compare", nargs="?", const="previous", default=None,
+                        help="compare with the results of this commit (default: the previous one benchmarked)")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="fail if the overhead is this many times larger than in the compared commit")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    work_dir = tempfile.mkdtemp(prefix="energy-runner-")
+    cwd = os.getcwd()
+    profiler = cProfile.Profile() if args.profile else None
+    log = io.StringIO()
+    try:
+        # The results store, caches and idle baselines are relative to the working directory
+        os.chdir(work_dir)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(log):
+            if profiler is not None:
+                profiler.enable()
+            try:
+                experiment_dir, events, tasks, discovered = run_simulated_experiment(args, work_dir)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        wall = time.perf_counter() - start
+        problems = check_experiment(args, experiment_dir, events, tasks, discovered)
+    except Exception:
+        print(log.getvalue()[-5000:], file=sys.stderr)
+        raise
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    simulated = simulated_seconds(args)
+    runs = (1 if args.single_build else args.tasks) * args.iterations
+    overhead = wall - simulated
+    print(f"{args.tasks} tasks x {args.iterations} iterations{' (single build)' if args.single_build else ''}, "
+          f"{args.schema} schema, {args.speed:g}x speed")
+    print(f"  wall time        {wall:8.2f} s")
+    print(f"  simulated work   {simulated:8.2f} s")
+    print(f"  runner overhead  {overhead:8.2f} s ({overhead / runs * 1000:.0f} ms per run)")
+
+    if profiler is not None:
+        stats = io.StringIO()
+        pstats.Stats(profiler, stream=stats).sort_stats("cumulative").print_stats(args.profile)
+        print(stats.getvalue())
+
+    scale = f"{args.tasks}x{args.iterations}" + ("-single" if args.single_build else "")
+    record = {"commit": git_commit(), "time": time.time(), "scale": scale, "schema": args.schema, "case": "run_experiment",
+              "speed": args.speed, "task_duration": args.task_duration, "seconds": wall, "overhead": overhead,
+              "simulated": simulated, "problems": problems}
+    previous = load_results(output)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+    failed = bool(problems)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+
+    if args.compare is not None:
+        old = baseline_results(previous, args.compare, record["commit"]).get((scale, args.schema, "run_experiment"))
+        if old is None:
+            print(f"No results of {args.compare} to compare with.")
+        else:
+            ratio = overhead / old["overhead"] if old["overhead"] > 0 else float("inf")
+            print(f"Overhead {ratio:.2f}x of {old['commit']} ({old['overhead']:.2f} s)")
+            if ratio > args.max_slowdown:
+                print(f"FAIL: overhead grew more than {args.max_slowdown:g}x")
+                failed = True
+
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
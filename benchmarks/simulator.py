@@ -0,0 +1,260 @@
+"""
+Simulated EnergiBridge and Gradle, so run_experiment can run end-to-end on any Linux machine
+without root, hardware counters or a real Gradle project.
+
+create_simulation writes into a directory:
+
+    project/             a Gradle project stand-in (settings.gradle, gradlew, simulator.json)
+    energibridge         writes schema-correct results.csv files while it runs a command
+    bin/gradle           answers the task discovery (gradle <cmd> --rerun-tasks --dry-run)
+
+Both stand-ins follow the same schedule from simulator.json: a Gradle startup phase, then every
+requested task for its configured duration at its configured power. Time runs `speed` times
+faster than the wall clock: the CSV timestamps and the task timeline are in simulated time,
+and `sleep N` under the fake EnergiBridge takes N / speed seconds.
+"""
+
+import json
+import os
+import random
+import stat
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE = "simulator.json"
+EPOCH_VARIABLE = "SIMULATOR_EPOCH"
+
+DEFAULT_CONFIG = {
+    "speed": 20.0,          # simulated seconds per wall-clock second
+    "interval": 0.2,        # simulated seconds between samples
+    "schema": "energy",     # "energy" (Linux counters) or "power" (Windows power readings)
+    "idle_power": 8.0,      # W
+    "ram_fraction": 0.12,   # DRAM power relative to package power
+    "noise": 0.05,          # relative standard deviation of every power reading
+    "startup": {"duration": 1.0, "power": 20.0},
+    "default_task": {"duration": 5.0, "power": 30.0},
+    "tasks": {},            # task path -> {"duration": s, "power": W}
+    "clean_duration": 0.5,
+    "fail": [],             # tasks that exit with an error
+}
+
+SCRIPT_TEMPLATE = """#!{python}
+import sys
+sys.path.insert(0, {root!r})
+from benchmarks.simulator import {function}
+sys.exit({function}(sys.argv[1:], {config_path!r}))
+"""
+
+
+def load_config(config_path):
+    with open(config_path, encoding="utf-8") as f:
+        return {**DEFAULT_CONFIG, **json.load(f)}
+
+
+def write_script(path, function, config_path):
+    with open(path, "w") as f:
+        f.write(SCRIPT_TEMPLATE.format(python=sys.executable, root=ROOT, function=function, config_path=config_path))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def create_simulation(directory, tasks, **config):
+    """
+    Write the simulated project, EnergiBridge and gradle into directory. tasks maps task paths
+    to {"duration": s, "power": W} (or None for the defaults); other keyword arguments override
+    DEFAULT_CONFIG. Returns (project directory, energibridge path, directory to put on PATH).
+    """
+    project_dir = os.path.join(directory, "project")
+    bin_dir = os.path.join(directory, "bin")
+    os.makedirs(project_dir, exist_ok=True)
+    os.makedirs(bin_dir, exist_ok=True)
+
+    config_path = os.path.join(project_dir, CONFIG_FILE)
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump({**DEFAULT_CONFIG, **config, "tasks": {task: spec or {} for task, spec in tasks.items()}}, f, indent=2)
+    with open(os.path.join(project_dir, "settings.gradle"), "w") as f:
+        f.write("rootProject.name = 'simulated'\n")
+
+    energibridge_path = os.path.join(directory, "energibridge")
+    write_script(os.path.join(project_dir, "gradlew"), "gradlew_main", config_path)
+    write_script(os.path.join(bin_dir, "gradle"), "gradle_main", config_path)
+    write_script(energibridge_path, "energibridge_main", config_path)
+    return project_dir, energibridge_path, bin_dir
+
+
+def task_spec(config, task):
+    return {**config["default_task"], **config["tasks"].get(task, {})}
+
+
+def gradle_tasks(args):
+    """
+    The tasks of a Gradle command line, without its options.
+    """
+    tasks = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg == "--init-script":
+            skip = True
+        elif not arg.startswith("-"):
+            tasks.append(arg)
+    return tasks
+
+
+def schedule(config, tasks):
+    """
+    (task, start, end, power) phases of a build in simulated seconds, starting with Gradle's startup.
+    A clean build only has its clean phase.
+    """
+    if tasks == ["clean"]:
+        return [("clean", 0.0, config["clean_duration"], config["startup"]["power"])]
+    phases = [("startup", 0.0, config["startup"]["duration"], config["startup"]["power"])]
+    for task in tasks:
+        spec = task_spec(config, task)
+        start = phases[-1][2]
+        phases.append((task, start, start + spec["duration"], spec["power"]))
+    return phases
+
+
+def simulated_time(epoch, speed):
+    """
+    Simulated epoch seconds: the wall clock since epoch, sped up.
+    """
+    return epoch + (time.time() - epoch) * speed
+
+
+def command_schedule(config, command):
+    """
+    The phases the command under EnergiBridge will go through, as far as the simulation knows.
+    """
+    words = [word for part in command for word in part.split()]
+    for i, word in enumerate(words):
+        if os.path.basename(word) == "gradlew":
+            return schedule(config, gradle_tasks(words[i + 1:]))
+    return []
+
+
+def idle_seconds(command):
+    """
+    The duration of an idle measurement (sleep N / timeout /T N), or None for other commands.
+    """
+    if len(command) >= 2 and command[0] == "sleep":
+        return float(command[1])
+    if len(command) >= 3 and command[0] == "timeout" and command[1].upper() == "/T":
+        return float(command[2])
+    return None
+
+
+def energibridge_main(argv, config_path):
+    """
+    Stand-in for `energibridge -o FILE [--summary] COMMAND...`: runs the command while writing
+    samples of the simulated power to FILE, in the columns EnergiBridge uses on the configured platform.
+    """
+    config = load_config(config_path)
+    output, summary, command = "results.csv", False, list(argv)
+    while command and command[0].startswith("-"):
+        option = command.pop(0)
+        if option in ("-o", "--output"):
+            output = command.pop(0)
+        elif option == "--summary":
+            summary = True
+
+    speed, interval = config["speed"], config["interval"]
+    phases = command_schedule(config, command)
+    rng = random.Random()
+    epoch = time.time()
+
+    def power_at(elapsed):
+        power = next((p for _, start, end, p in phases if start <= elapsed < end), config["idle_power"])
+        return power * max(rng.gauss(1, config["noise"]), 0)
+
+    if config["schema"] == "energy":
+        header = ["Delta", "Time", "CPU_USAGE_0", "DRAM_ENERGY (J)", "PACKAGE_ENERGY (J)", "TOTAL_MEMORY", "USED_MEMORY"]
+    else:
+        header = ["Delta", "Time", "CPU_POWER (Watts)", "CPU_USAGE_0", "TOTAL_MEMORY", "USED_MEMORY"]
+
+    idle = idle_seconds(command)
+    process = None
+    if idle is None:
+        process = subprocess.Popen(command, env={**os.environ, EPOCH_VARIABLE: repr(epoch)})
+
+    package, dram, last = 0.0, 0.0, epoch
+    with open(output, "w") as f:
+        f.write(",".join(header) + "\n")
+
+        def sample():
+            nonlocal package, dram, last
+            now = simulated_time(epoch, speed)
+            delta = now - last
+            power = power_at(now - epoch)
+            package += power * delta
+            dram += power * config["ram_fraction"] * delta
+            usage = min(100.0, 100.0 * power / max(config["default_task"]["power"] * 2, 1))
+            if config["schema"] == "energy":
+                row = [round(delta * 1000), int(now * 1000), f"{usage:.2f}", f"{dram:.6f}", f"{package:.6f}", 17179869184, 6442450944]
+            else:
+                row = [round(delta * 1000), int(now * 1000), f"{power:.3f}", f"{usage:.2f}", 17179869184, 6442450944]
+            f.write(",".join(str(value) for value in row) + "\n")
+            f.flush()
+            last = now
+
+        sample()
+        end = epoch + idle / speed if idle is not None else None
+        while (process.poll() is None) if process is not None else (time.time() < end):
+            time.sleep(interval / speed)
+            sample()
+        sample()
+
+    if summary:
+        print(f"Energy consumption in joules: {package:.2f} for {simulated_time(epoch, speed) - epoch:.2f} sec of execution.")
+    return process.returncode if process is not None else 0
+
+
+def gradlew_main(argv, config_path):
+    """
+    Stand-in for ./gradlew: "runs" the requested tasks for their simulated durations and, with
+    the task timeline init script, records their start/end times next to the script.
+    """
+    # Imported here so the stand-in starts without loading the runner
+    from logic.task_timeline import TASK_TIMELINE_FILE
+
+    config = load_config(config_path)
+    speed = config["speed"]
+    epoch = float(os.environ.get(EPOCH_VARIABLE, time.time()))
+    timeline = None
+    if "--init-script" in argv:
+        init_script = argv[argv.index("--init-script") + 1]
+        timeline = open(os.path.join(os.path.dirname(init_script), TASK_TIMELINE_FILE), "w")
+        timeline.write("Task,Start,End\n")
+
+    try:
+        for task, start, end, _ in schedule(config, gradle_tasks(argv)):
+            started = int(simulated_time(epoch, speed) * 1000)
+            time.sleep((end - start) / speed)
+            if task == "startup":
+                continue
+            print(f"> Task {task}")
+            if timeline is not None:
+                timeline.write(f"{task},{started},{int(simulated_time(epoch, speed) * 1000)}\n")
+                timeline.flush()
+            if task in config["fail"]:
+                print(f"FAILURE: Build failed with an exception in {task}.", file=sys.stderr)
+                return 1
+    finally:
+        if timeline is not None:
+            timeline.close()
+    print("BUILD SUCCESSFUL")
+    return 0
+
+
+def gradle_main(argv, config_path):
+    """
+    Stand-in for the gradle task discovery: lists every configured task as SKIPPED.
+    """
+    config = load_config(config_path)
+    for task in config["tasks"]:
+        print(f"{task} SKIPPED")
+    print("BUILD SUCCESSFUL")
+    return 0
@@ -0,0 +1,81 @@
+"""
+Startup-time benchmark for the GUI.
+
+Measures, in fresh interpreters, how long it takes to import gui.app and bring up the
+Home window, and fails if the median exceeds the budget or if any of the statistics
+dependencies were loaded on the way.
+
+    python -m benchmarks.startup [--runs 5] [--budget 1.0]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be loaded once the statistics view is opened
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "seaborn")
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import tkinter as tk
+from gui.app import App
+imported = time.perf_counter()
+try:
+    app = App()
+    app.update()
+    shown = time.perf_counter() - start
+    app.destroy()
+except tk.TclError:
+    shown = None  # no display available
+print(json.dumps({
+    "import": imported - start,
+    "shown": shown,
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_startup():
+    result = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0, help="maximum median startup time in seconds")
+    args = parser.parse_args(argv)
+
+    samples = [measure_startup() for _ in range(args.runs)]
+    import_time = statistics.median(s["import"] for s in samples)
+    shown = [s["shown"] for s in samples if s["shown"] is not None]
+    heavy = sorted({m for s in samples for m in s["heavy"]})
+
+    print(f"import gui.app: {import_time * 1000:.1f} ms (median of {args.runs})")
+    if shown:
+        startup_time = statistics.median(shown)
+        print(f"Home window shown: {startup_time * 1000:.1f} ms (median of {len(shown)})")
+    else:
+        startup_time = import_time
+        print("No display available, only the import time was measured.")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: modules loaded at startup: {', '.join(heavy)}")
+        failed = True
+    if startup_time > args.budget:
+        print(f"FAIL: startup took {startup_time:.3f} s, budget is {args.budget:.3f} s")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
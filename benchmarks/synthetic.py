@@ -0,0 +1,103 @@
+"""
+Generator of synthetic experiment_results trees for benchmarking the analysis pipeline.
+
+Writes experiments with the layout run_experiment produces (<experiment>/<task>/<run>/results.csv
+plus the idle samples), filled with EnergiBridge-like traces in one of two schemas:
+
+    energy  Linux: cumulative PACKAGE_ENERGY (J) and DRAM_ENERGY (J) counters
+    power   Windows: CPU_POWER (Watts) readings, no DRAM metric
+
+    python -m benchmarks.synthetic OUTPUT_DIR [--tasks 10] [--runs 10] [--samples 1000] [--schema energy]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+SCHEMAS = ("energy", "power")
+SAMPLE_MS = 200  # EnergiBridge's default sample interval
+CORES = 8
+
+
+def synthetic_trace(rng, samples, schema, start_ms, base_power, cores=CORES):
+    """
+    One run's EnergiBridge trace: samples at a jittered 200 ms, a power profile ramping up
+    from idle to base_power with noise, and per-core usage, frequency and memory columns.
+    """
+    delta = np.maximum(rng.normal(SAMPLE_MS, 5, samples), 1).round().astype("int64")
+    delta[0] = 0
+    times = start_ms + np.cumsum(delta)
+    ramp = np.minimum(np.arange(samples) / max(samples * 0.1, 1), 1)
+    power = base_power * (0.3 + 0.7 * ramp) * rng.lognormal(0, 0.08, samples)
+
+    columns = {"Delta": delta, "Time": times}
+    for core in range(cores):
+        columns[f"CPU_FREQUENCY_{core}"] = rng.integers(800, 4800, samples)
+    for core in range(cores):
+        columns[f"CPU_USAGE_{core}"] = np.clip(ramp * 80 + rng.normal(0, 10, samples), 0, 100).round(2)
+
+    if schema == "energy":
+        seconds = delta / 1_000
+        columns["DRAM_ENERGY (J)"] = 5_000 + np.cumsum(power * 0.12 * seconds)
+        columns["PACKAGE_ENERGY (J)"] = 80_000 + np.cumsum(power * seconds)
+    else:
+        columns["CPU_POWER (Watts)"] = power.round(3)
+    columns["TOTAL_MEMORY"] = np.full(samples, 16 * 1024**3)
+    columns["USED_MEMORY"] = (6 * 1024**3 + rng.normal(0, 1, samples).cumsum() * 1024**2).astype("int64")
+    return pd.DataFrame(columns)
+
+
+def generate_experiment(base_dir, name="synthetic", tasks=10, runs=10, samples=1000, schema="energy", seed=0):
+    """
+    Write one synthetic experiment into base_dir and return its directory.
+    Every task gets its own power level, so the summary has something to tell apart.
+    """
+    if schema not in SCHEMAS:
+        raise ValueError(f"Unknown schema {schema}, expected one of {', '.join(SCHEMAS)}")
+    rng = np.random.default_rng(seed)
+    experiment_dir = os.path.join(base_dir, f"{name}_{time.strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(experiment_dir, exist_ok=True)
+
+    start_ms = int(time.time() * 1000) - tasks * runs * samples * SAMPLE_MS
+    idle_power = 8.0
+    idle = synthetic_trace(rng, 75, schema, start_ms, idle_power)
+    idle.to_csv(os.path.join(experiment_dir, "idle_consumption.csv"), index=False)
+    with open(os.path.join(experiment_dir, "idle_samples.jsonl"), "w", encoding="utf-8") as f:
+        f.write(json.dumps({"time": start_ms / 1000, "cpu_energy": idle_power * 15, "duration": 15.0,
+                            "source": "measured", "host": "synthetic"}) + "\n")
+
+    for t in range(tasks):
+        task_dir = os.path.join(experiment_dir, f"_module{t % 5}_task{t}")
+        base_power = rng.uniform(15, 60)
+        for run in range(1, runs + 1):
+            run_dir = os.path.join(task_dir, str(run))
+            os.makedirs(run_dir, exist_ok=True)
+            trace = synthetic_trace(rng, samples, schema, start_ms, base_power)
+            trace.to_csv(os.path.join(run_dir, "results.csv"), index=False)
+            start_ms = int(trace["Time"].iloc[-1]) + 1_000
+    return experiment_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir", help="experiment_results directory to write into")
+    parser.add_argument("--name", default="synthetic")
+    parser.add_argument("--tasks", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--samples", type=int, default=1000, help="samples per run")
+    parser.add_argument("--schema", choices=SCHEMAS, default="energy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    experiment_dir = generate_experiment(args.output_dir, args.name, args.tasks, args.runs, args.samples, args.schema, args.seed)
+    print(experiment_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
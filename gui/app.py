@@ -1,8 +1,16 @@
+import importlib
+import sys
 import tkinter as tk
-from gui.views.home_view import HomeView
-from gui.views.statistics.statistics_view import StatisticsView
-from gui.views.settings_view import SettingsView
-import matplotlib.pyplot as plt
+
+from gui.styles import configure_styles
+
+# Views are imported and built the first time they are shown, so that the
+# statistics dependencies (pandas, matplotlib, seaborn) don't delay startup.
+VIEWS = {
+    "HomeView": ("gui.views.home_view", "HomeView"),
+    "StatisticsView": ("gui.views.statistics.statistics_view", "StatisticsView"),
+    "SettingsView": ("gui.views.settings_view", "SettingsView"),
+}
 
 class App(tk.Tk):
     def __init__(self):
@@ -10,6 +18,7 @@ class App(tk.Tk):
         self.title("GRADLENERGY GUI")
         self.geometry("500x300")
         self.minsize(500, 300)
+        configure_styles()
 
         self.container = tk.Frame(self)
         self.container.pack(fill="both", expand=True)
@@ -18,24 +27,28 @@ class App(tk.Tk):
         self.container.grid_columnconfigure(0, weight=1)
 
         self.frames = {}
-        self._init_views()
         self.show_frame("HomeView")
 
         # Register clean shutdown handler
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
-    def _init_views(self):
-        for ViewClass in (HomeView, StatisticsView, SettingsView):
-            view_name = ViewClass.__name__
+    def _get_view(self, view_name):
+        frame = self.frames.get(view_name)
+        if frame is None:
+            module_name, class_name = VIEWS[view_name]
+            ViewClass = getattr(importlib.import_module(module_name), class_name)
             frame = ViewClass(parent=self.container, controller=self)
             self.frames[view_name] = frame
             frame.grid(row=0, column=0, sticky="nsew")
+        return frame
 
     def show_frame(self, view_name):
-        frame = self.frames[view_name]
+        frame = self._get_view(view_name)
         frame.tkraise()
 
     def on_closing(self):
-        # Clean up matplotlib figures to prevent delays on exit
-        plt.close('all')
+        # Clean up matplotlib figures to prevent delays on exit (only if the statistics were opened)
+        plt = sys.modules.get("matplotlib.pyplot")
+        if plt is not None:
+            plt.close('all')
         self.destroy()
\ No newline at end of file
@@ -0,0 +1,25 @@
+from tkinter import ttk
+
+
+def configure_styles():
+    """
+    Configure the ttk theme and styles shared by all views.
+    Must run before any view is built, as views are created lazily.
+    """
+    style = ttk.Style()
+    style.theme_use("clam")  # Alternative themes: "alt", "default", "classic"
+    style.configure("TFrame", background="#f0f0f0")
+    style.configure("TLabel", font=("Arial", 14, "bold"), background="#f0f0f0", foreground="#333")
+    style.configure("TEntry", font=("Arial", 12), padding=5)
+    style.configure("run.TButton", font=("Arial", 12, "bold"), background="#4CAF50", foreground="white", padding=10)
+    style.map("run.TButton", background=[("disabled", "#e0e0e0"), ("active", "#45a049")], foreground=[("disabled", "gray")])
+
+    style.configure("browse.TButton", font=("Arial", 12, "bold"), background="#2196F3", foreground="white", padding=10, width=25)
+    style.map("browse.TButton", background=[("active", "#1976D2")])
+
+    style.configure("TCheckbutton", font=("Arial", 12), foreground="#333", background="#f0f0f0", padding=0, width=20)
+    style.configure("task.TCheckbutton", font=("Arial", 12), foreground="#333", background="white", padding=0, width=20)
+    style.map("task.TCheckbutton", foreground=[("!selected", "#000000"), ("selected", "#33adff")])
+
+    style.configure("help.TButton", font=("Arial", 10, "bold"), padding=5, foreground="#ffffff", background="#2196F3", relief="flat")
+    style.map("help.TButton", background=[("active", "#1976D2")], foreground=[("disabled", "gray")])
@@ -6,7 +6,13 @@ from tkinter import ttk, messagebox, filedialog
 import threading
 import queue
 
-from logic.experiment_setup import getTasks, run_experiment, set_energibridge_path, set_gradle_repository_path
+from gui.views.task_checklist import TaskChecklist
+from logic.events import (
+    ExperimentError, ExperimentStarted, IterationFinished, QueueSink, RunProgress, TaskConverged, TaskStarted, WarmupProgress,
+    format_duration,
+)
+from logic.experiment_setup import get_tasks_cached, resume_experiment, run_experiment, set_energibridge_path, set_gradle_repository_path
+from logic.journal import JOURNAL_FILE
 
 
 class SettingsView(tk.Frame):
@@ -20,16 +26,27 @@ class SettingsView(tk.Frame):
     timeout_task_entry = None
     command_entry = None
     warmup_var = None
-    scrollable_frame = None
+    single_build_var = None
+    adaptive_cooldown_var = None
+    adaptive_iterations_var = None
+    task_checklist = None
     vars_dict = None
     running = False
     message_queue = queue.Queue()
+    event_queue = queue.Queue()  # progress events of the running experiment
+    discovery_queue = None
+
+    DISCOVERY_POLL_MS = 50
+    DISCOVERY_BATCH_SIZE = 2000  # tasks taken from the queue per poll, keeps the window responsive
 
     HELP_TEXTS = {
         "iterations": "Repeating the experiment improves measurement reliability.\nRecommended: 30+ iterations for statistical significance.",
-        "timeout_repetitions": "Rest between repetitions prevents overlap and system noise during measurements of different repetitions.\nRecommended: 5 minutes depending on task duration and computational intesity.\nIn case of timeout > 120s, another warmup session is executed.",
+        "timeout_repetitions": "Rest between repetitions prevents overlap and system noise during measurements of different repetitions.\nRecommended: 5 minutes depending on task duration and computational intesity.\nIn case of a pause > 120s, another warmup session of at most 2 minutes is executed.",
         "timeout_tasks": "Pause between tasks helps stabilize system temperature and avoids tail energy consumption.\nRecommended: 60 seconds depending on task duration and computational intesity.",
-        "warmup": "Perform a warmup run to stabilize hardware temperature avoiding bias from cooler initial runs.\nBest practice: run CPU-intensive tasks, in our case 5 minutes of Fibonacci sequence.",
+        "warmup": "Perform a warmup run to stabilize hardware temperature avoiding bias from cooler initial runs.\nBest practice: run CPU-intensive tasks, in our case the Fibonacci sequence on all cores until package power and temperature stop changing (1 to 5 minutes).",
+        "adaptive_iterations": "Treat the number of iterations as a maximum: a task stops being measured once it ran at least 10 times and the 95% confidence interval of its mean energy is narrower than 5% of the mean.\nStable tasks finish early, noisy tasks get more runs.",
+        "adaptive_cooldown": "Measure the power during the timeouts and continue as soon as it is back within 10% of the idle baseline.\nThe timeouts become maximum waits, so they can be set generously.\nPower is read from RAPL when readable, otherwise sampled with EnergiBridge.",
+        "single_build": "Run all selected tasks in one Gradle build per iteration instead of one build per task.\nThe energy of each build is split across the recorded start/end times of its tasks; tasks running in parallel share the energy of their overlap.\nMuch faster for many tasks, but tasks are no longer measured in isolation.",
         "system_precautions":
             """ Zen Mode:
             - all applications should be closed, notifications should be turned off;
@@ -52,25 +69,6 @@ class SettingsView(tk.Frame):
         super().__init__(parent)
         self.controller = controller
 
-        # Style configurations
-        style = ttk.Style()
-        style.theme_use("clam")  # Alternative themes: "alt", "default", "classic"
-        style.configure("TFrame", background="#f0f0f0")
-        style.configure("TLabel", font=("Arial", 14, "bold"), background="#f0f0f0", foreground="#333")
-        style.configure("TEntry", font=("Arial", 12), padding=5)
-        style.configure("run.TButton", font=("Arial", 12, "bold"), background="#4CAF50", foreground="white", padding=10)
-        style.map("run.TButton", background=[("disabled", "#e0e0e0"), ("active", "#45a049")], foreground=[("disabled", "gray")])
-
-        style.configure("browse.TButton", font=("Arial", 12, "bold"), background="#2196F3", foreground="white", padding=10, width=25)
-        style.map("browse.TButton", background=[("active", "#1976D2")])
-
-        style.configure("TCheckbutton", font=("Arial", 12), foreground="#333", background="#f0f0f0", padding=0, width=20)
-        style.configure("task.TCheckbutton", font=("Arial", 12), foreground="#333", background="white", padding=0, width=20)
-        style.map("task.TCheckbutton", foreground=[("!selected", "#000000"), ("selected", "#33adff")])
-
-        style.configure("help.TButton", font=("Arial", 10, "bold"), padding=5, foreground="#ffffff", background="#2196F3", relief="flat")
-        style.map("help.TButton", background=[("active", "#1976D2")], foreground=[("disabled", "gray")])
-
         header_frame = ttk.Frame(self, style="TFrame")
         header_frame.pack(side="top", fill="x", padx=10, pady=(10, 10))
 
@@ -132,6 +130,30 @@ class SettingsView(tk.Frame):
         self.warmup_check = ttk.Checkbutton(warmup_frame, text="Perform warmup", variable=self.warmup_var)
         self.warmup_check.pack(side="left")
         ttk.Button(warmup_frame, text="?", width=2, style="help.TButton", command=lambda: self.show_help("Warmup", self.HELP_TEXTS["warmup"])).pack(side="left", padx=5)
+
+        # Checkbox for single build mode
+        self.single_build_var = tk.IntVar()
+        single_build_frame = ttk.Frame(self)
+        single_build_frame.pack(pady=5)
+        self.single_build_check = ttk.Checkbutton(single_build_frame, text="Single build", variable=self.single_build_var)
+        self.single_build_check.pack(side="left")
+        ttk.Button(single_build_frame, text="?", width=2, style="help.TButton", command=lambda: self.show_help("Single build", self.HELP_TEXTS["single_build"])).pack(side="left", padx=5)
+
+        # Checkbox for adaptive iteration count
+        self.adaptive_iterations_var = tk.IntVar()
+        adaptive_iterations_frame = ttk.Frame(self)
+        adaptive_iterations_frame.pack(pady=5)
+        self.adaptive_iterations_check = ttk.Checkbutton(adaptive_iterations_frame, text="Adaptive iterations", variable=self.adaptive_iterations_var)
+        self.adaptive_iterations_check.pack(side="left")
+        ttk.Button(adaptive_iterations_frame, text="?", width=2, style="help.TButton", command=lambda: self.show_help("Adaptive iterations", self.HELP_TEXTS["adaptive_iterations"])).pack(side="left", padx=5)
+
+        # Checkbox for adaptive cooldown
+        self.adaptive_cooldown_var = tk.IntVar()
+        adaptive_cooldown_frame = ttk.Frame(self)
+        adaptive_cooldown_frame.pack(pady=5)
+        self.adaptive_cooldown_check = ttk.Checkbutton(adaptive_cooldown_frame, text="Adaptive cooldown", variable=self.adaptive_cooldown_var)
+        self.adaptive_cooldown_check.pack(side="left")
+        ttk.Button(adaptive_cooldown_frame, text="?", width=2, style="help.TButton", command=lambda: self.show_help("Adaptive cooldown", self.HELP_TEXTS["adaptive_cooldown"])).pack(side="left", padx=5)
         
         buttons_frame = ttk.Frame(self)
         buttons_frame.pack(side=tk.TOP, pady=5)
@@ -165,46 +187,34 @@ class SettingsView(tk.Frame):
         self.filter_entry = ttk.Entry(frame3, style="TEntry", width=30)
         self.filter_entry.pack(pady=6, side="left")
         self.filter_entry.insert(0, "*")  # Wildcard by default
+        # Narrow the list while typing; the Filter button selects the matches
+        self.filter_entry.bind("<KeyRelease>", lambda e: self.task_checklist.set_filter(self.filter_entry.get()))
 
-        ttk.Button(frame3, text="Filter", width=7, style="help.TButton", command=lambda: self.updateTaskList()).pack(
+        ttk.Button(frame3, text="Filter", width=7, style="help.TButton", command=lambda: self.updateTaskList(rediscover=False)).pack(
             side="left", padx=5)
 
         ttk.Button(frame3, text="Deselect All Tasks", style="help.TButton",
                    command=self.deselect_all_tasks).pack(side="left", padx=5)
 
-        # Scrollable frame for task list
+        # Task discovery progress
+        frame4 = ttk.Frame(self)
+        frame4.pack(pady=1)
+        self.discovery_progress = ttk.Progressbar(frame4, mode="indeterminate", length=150)
+        self.discovery_progress.pack(side="left", padx=5)
+        self.discovery_label = ttk.Label(frame4, text="", style="TLabel", width=30)
+        self.discovery_label.pack(side="left", padx=5)
+        self.cancel_discovery_button = ttk.Button(frame4, text="Cancel", width=7, style="help.TButton",
+                                                  command=self.cancel_task_discovery, state='disabled')
+        self.cancel_discovery_button.pack(side="left", padx=5)
+
+        # Virtualized task list: only the rows on screen are widgets
         container = ttk.Frame(self, height=150)
         container.pack(fill="x", pady=10, anchor='n')
         container.pack_propagate(False)  # 💡 Important!
 
-        canvas = tk.Canvas(container, bg="white", highlightthickness=0, height=300)
-        canvas.pack(side="left", fill="both", expand=True)
-
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollbar.pack(side="right", fill="y")
-
-        self.scrollable_frame = ttk.Frame(canvas)
-
-        # Make the scroll region adapt to content
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
-
-        canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self.task_checklist = TaskChecklist(container)
+        self.task_checklist.pack(fill="both", expand=True)
 
-        # container.pack(fill="both", expand=True) 
-
-        # Mouse wheel scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-
-        
         self.label = ttk.Label(self, text="", style="TLabel")
         self.label.pack(pady=5)
 
@@ -213,6 +223,10 @@ class SettingsView(tk.Frame):
                                      style="run.TButton", state='disabled')
         self.run_button.pack(side=tk.TOP, fill="x", pady=10)
 
+        # Continue an experiment that was interrupted
+        ttk.Button(self, text="Resume Experiment", command=self.resume_experiment_wrapper,
+                   style="browse.TButton").pack(side=tk.TOP, pady=(0, 10))
+
     def update_label(self, text:str):
         self.label.config(text=text, foreground="#4CAF50")  # Green text
 
@@ -302,11 +316,7 @@ class SettingsView(tk.Frame):
 
 
     def getEnabledTasks(self):
-        enabled_tasks = []
-        for task, var in self.task_dict.items():
-            if var.get():
-                enabled_tasks.append(task)
-        return enabled_tasks
+        return self.task_checklist.selected_tasks()
 
     def run_experiment_wrapper(self):
         # Check if a Gradle project folder was selected
@@ -346,6 +356,9 @@ class SettingsView(tk.Frame):
             return
 
         warmup = bool(self.warmup_var.get())
+        single_build = bool(self.single_build_var.get())
+        adaptive_cooldown = bool(self.adaptive_cooldown_var.get())
+        adaptive_iterations = bool(self.adaptive_iterations_var.get())
 
         if (self.running):
             messagebox.showerror("Input Error", "Experiment already running.")
@@ -356,61 +369,158 @@ class SettingsView(tk.Frame):
 
         # Call the experiment logic with the provided parameters.
         threading.Thread(target=run_experiment
-                        , args=(exp_name, iterations, timeout_rep, timeout_task, warmup, enabled_tasks, self.message_queue), daemon=True).start()
+                        , args=(exp_name, iterations, timeout_rep, timeout_task, warmup, enabled_tasks, self.message_queue, single_build)
+                        , kwargs={"sink": QueueSink(self.event_queue), "adaptive_cooldown": adaptive_cooldown,
+                                  "adaptive_iterations": adaptive_iterations}, daemon=True).start()
 
         self.check_result()
 
-    def updateTaskList(self):
-        if self.repository is None:
-            messagebox.showerror("Error", "Please select a Gradle project folder.")
+    def resume_experiment_wrapper(self):
+        if (self.running):
+            messagebox.showerror("Input Error", "Experiment already running.")
             return
 
-        #Preserve previous selections
-        previous_selections = getattr(self, 'task_dict', {}).copy()
-
-        # Clear current checkboxes
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        self.task_dict = {}
-        task_list = getTasks(self.command_entry.get())
-        filter_text = self.filter_entry.get().strip().lower()
-
-        #Pre-check if we are using wildcard
-        is_wildcard = filter_text == "*"
-
-        for task in task_list:
-            var = tk.IntVar(value=0)  # Start deselected
+        experiment_dir = filedialog.askdirectory(title="Select the folder of the interrupted experiment")
+        if not experiment_dir:
+            return
+        if not os.path.isfile(os.path.join(experiment_dir, JOURNAL_FILE)):
+            messagebox.showerror("Input Error", "This folder has no experiment journal.")
+            return
 
-            # Keep previous selection
-            if task in previous_selections and previous_selections[task].get() == 1:
-                var.set(1)
+        self.run_button.config(state='disabled')
+        self.running = True
+        self.update_label("Resuming experiment...")
 
-            # If wildcard, select all
-            if is_wildcard:
-                var.set(1)
-            # Else, if matches filter, select
-            elif filter_text and filter_text in task.lower():
-                var.set(1)
+        threading.Thread(target=resume_experiment, args=(experiment_dir, self.message_queue),
+                         kwargs={"sink": QueueSink(self.event_queue)}, daemon=True).start()
 
-            self.task_dict[task] = var
-            chk = ttk.Checkbutton(self.scrollable_frame, text=task, variable=var, style="task.TCheckbutton")
-            chk.pack(anchor="nw", fill="both")
+        self.check_result()
 
-        self.update_idletasks()
+    def updateTaskList(self, rediscover=True):
+        """
+        Fill the task checklist. With rediscover=False the tasks matching the filter are
+        selected among those found last time for the same command; otherwise the tasks
+        are discovered in the background and added as Gradle reports them.
+        """
+        if self.repository is None:
+            messagebox.showerror("Error", "Please select a Gradle project folder.")
+            return
 
-        if not self.running:
-            self.run_button.config(state='normal')
+        command = self.command_entry.get()
+        if rediscover or getattr(self, 'task_list_key', None) != (self.repository, command):
+            self.start_task_discovery(command)
+            return
 
-        if len(task_list) == 0:
-            messagebox.showerror("Input Error", "No tasks found")
+        self.task_checklist.select_matching(self.filter_entry.get())
+
+    def start_task_discovery(self, command):
+        self.cancel_task_discovery(show=False)
+
+        # Keep previous selections
+        self.discovery_selections = set(self.task_checklist.selected)
+        self.task_checklist.clear()
+        self.task_list = []
+        self.task_list_key = None
+        self.discovery_cancel = threading.Event()
+        self.discovery_queue = queue.Queue()
+        threading.Thread(target=self.discover_tasks, args=(command, self.discovery_queue, self.discovery_cancel),
+                         daemon=True).start()
+
+        self.discovery_progress.start(10)
+        self.cancel_discovery_button.config(state='normal')
+        self.discovery_label.config(text="Discovering tasks...")
+        self.after(self.DISCOVERY_POLL_MS, self.poll_task_discovery, self.discovery_queue, command)
+
+    @staticmethod
+    def discover_tasks(command, results, cancel_event):
+        # Runs on a worker thread: only talks to the UI through the results queue
+        try:
+            tasks = get_tasks_cached(command, on_task=lambda task: results.put(("task", task)), cancel_event=cancel_event)
+            results.put(("done", tasks))
+        except Exception as e:
+            results.put(("error", str(e)))
+
+    def poll_task_discovery(self, results, command):
+        if results is not self.discovery_queue:
+            return  # cancelled or superseded by a newer discovery
+
+        batch = []
+        outcome = None
+        for _ in range(self.DISCOVERY_BATCH_SIZE):
+            try:
+                kind, value = results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "task":
+                batch.append(value)
+            else:
+                outcome = (kind, value)
+                break
+        if outcome is not None and outcome[0] == "done":
+            # Cached task lists arrive in one piece
+            batch.extend(outcome[1][len(self.task_list) + len(batch):])
+        self.add_discovered_tasks(batch)
+
+        if outcome is not None:
+            kind, value = outcome
+            if kind == "done":
+                self.task_list_key = (self.repository, command)
+                self.finish_task_discovery(f"Found {len(value)} tasks.")
+                if not self.running:
+                    self.run_button.config(state='normal')
+                if len(value) == 0:
+                    messagebox.showerror("Input Error", "No tasks found")
+            else:
+                self.finish_task_discovery("Task discovery failed.")
+                messagebox.showerror("Error", f"Task discovery failed: {value}")
+            return
 
+        self.discovery_label.config(text=f"Discovering tasks... {len(self.task_list)} found")
+        self.after(self.DISCOVERY_POLL_MS, self.poll_task_discovery, results, command)
 
+    def add_discovered_tasks(self, tasks):
+        # Preselect previously selected tasks and those matching the filter
+        filter_text = self.filter_entry.get().strip().lower()
+        selected = [
+            task for task in tasks
+            if task in self.discovery_selections or filter_text == "*" or (filter_text and filter_text in task.lower())
+        ]
+        self.task_list.extend(tasks)
+        self.task_checklist.add_tasks(tasks, selected)
+
+    def finish_task_discovery(self, text):
+        self.discovery_queue = None
+        self.discovery_progress.stop()
+        self.cancel_discovery_button.config(state='disabled')
+        self.discovery_label.config(text=text)
+
+    def cancel_task_discovery(self, show=True):
+        if getattr(self, 'discovery_queue', None) is None:
+            return
+        self.discovery_cancel.set()
+        self.finish_task_discovery("Task discovery cancelled." if show else "")
 
 
 
 
     def check_result(self):
+        while True:
+            try:
+                event = self.event_queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(event, ExperimentError) and event.task is None:
+                # The experiment stopped
+                messagebox.showerror("Experiment", f"Experiment failed: {event.message}")
+                self.label.config(text="Experiment failed.", foreground="#f44336")
+                self.running = False
+                if (self.repository):
+                    self.run_button.config(state='normal')
+                return
+            status = self.describe_event(event)
+            if status:
+                self.update_label(status)
+
         try:
             # Try to get message from queue (non-blocking)
             message = self.message_queue.get_nowait() # We can use this message later if we want. Or change the logic to show what is currently running.
@@ -428,6 +538,25 @@ class SettingsView(tk.Frame):
 
 
 
+    @staticmethod
+    def describe_event(event):
+        if isinstance(event, ExperimentStarted):
+            return "Measuring idle consumption..."
+        if isinstance(event, WarmupProgress):
+            return f"Warming up... {format_duration(event.remaining)} left"
+        if isinstance(event, TaskStarted):
+            return f"Iteration {event.iteration}: running {event.task}"
+        if isinstance(event, RunProgress):
+            power = f", {event.power:.1f} W" if event.power is not None else ""
+            return f"Iteration {event.iteration}: running {event.task} ({event.cpu_energy:.0f} J{power})"
+        if isinstance(event, ExperimentError):
+            return f"Iteration {event.iteration}: {event.message}"
+        if isinstance(event, TaskConverged):
+            return f"{event.task} converged after {event.runs} runs"
+        if isinstance(event, IterationFinished):
+            return f"Iteration {event.iteration}/{event.iterations} done, about {format_duration(event.eta)} left"
+        return None
+
     def show_help(self, title, message):
         help_window = tk.Toplevel(self)
         help_window.title(title)
@@ -463,6 +592,4 @@ class SettingsView(tk.Frame):
         help_window.geometry(f"+{x}+{y}")
 
     def deselect_all_tasks(self):
-        if hasattr(self, 'task_dict'):
-            for var in self.task_dict.values():
-                var.set(0)
+        self.task_checklist.deselect_all()
@@ -0,0 +1,86 @@
+import pandas as pd
+
+ENERGY_COLUMNS = ['CPU Energy', 'RAM Energy', 'CPU Compensation', 'Total Energy']
+# Energy type shown in the GUI -> aggregated column
+ENERGY_LABELS = {
+    'CPU Energy': 'CPU Energy',
+    'RAM Energy': 'RAM Energy',
+    'CPU Compensation': 'CPU Compensation',
+    'Both': 'Total Energy',
+}
+STATISTICS = ['mean', 'sum', 'count', 'std']
+
+
+class EnergyAggregates:
+    """
+    Per-(Experiment, Task) and per-Experiment mean/sum/count/std of every energy column,
+    shared by the charts. Statistics are recomputed only for experiments with new rows,
+    and chart selections are answered by index lookups memoized per data version.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.version = 0
+        self.task_stats = None
+        self.experiment_stats = None
+        self._memo = {}
+
+    def invalidate(self, experiments):
+        """
+        Recompute the statistics of the given experiments from the store.
+        """
+        experiments = sorted(experiments)
+        if not experiments:
+            return
+        rows = self.store.query(experiments)
+        rows['Total Energy'] = rows['CPU Energy'] + rows['RAM Energy']
+        task_stats = rows.groupby(['Experiment', 'Task'])[ENERGY_COLUMNS].agg(STATISTICS)
+        experiment_stats = rows.groupby('Experiment')[ENERGY_COLUMNS].agg(STATISTICS)
+
+        if self.task_stats is not None:
+            kept_tasks = ~self.task_stats.index.get_level_values('Experiment').isin(experiments)
+            task_stats = pd.concat([self.task_stats[kept_tasks], task_stats])
+            kept_experiments = ~self.experiment_stats.index.isin(experiments)
+            experiment_stats = pd.concat([self.experiment_stats[kept_experiments], experiment_stats])
+
+        # Sorted indexes make .loc lookups binary searches
+        self.task_stats = task_stats.sort_index()
+        self.experiment_stats = experiment_stats.sort_index()
+        self.version += 1
+        self._memo.clear()
+
+    def _present(self, experiments):
+        if self.experiment_stats is None:
+            return []
+        return [exp for exp in experiments if exp in self.experiment_stats.index]
+
+    def task_energy(self, experiments, energy_type, statistic='mean'):
+        """
+        Statistic of the energy per (Experiment, Task) for the given experiments.
+        Returns the DataFrame and the label of its energy column.
+        """
+        label = ENERGY_LABELS[energy_type]
+        key = ('task', tuple(experiments), label, statistic)
+        if key not in self._memo:
+            present = self._present(experiments)
+            if present:
+                values = self.task_stats.loc[present, (label, statistic)]
+            else:
+                values = pd.Series(dtype=float, index=pd.MultiIndex.from_tuples([], names=['Experiment', 'Task']))
+            self._memo[key] = values.rename(label).reset_index()
+        return self._memo[key], label
+
+    def experiment_totals(self, experiments, energy_type):
+        """
+        Total energy of all runs of each of the given experiments, indexed by experiment.
+        """
+        label = ENERGY_LABELS[energy_type]
+        key = ('experiment', tuple(experiments), label)
+        if key not in self._memo:
+            present = self._present(experiments)
+            if present:
+                values = self.experiment_stats.loc[present, (label, 'sum')]
+            else:
+                values = pd.Series(dtype=float, index=pd.Index([], name='Experiment'))
+            self._memo[key] = values.rename(label)
+        return self._memo[key]
@@ -3,15 +3,17 @@ from tkinter import ttk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib
 matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import numpy as np
 import seaborn as sns
 
 sns.set_theme(style="whitegrid")
 
 class BarChart(tk.Frame):
-    def __init__(self, parent, df):
+    def __init__(self, parent, aggregates):
         super().__init__(parent)
-        self.df = df
+        self.aggregates = aggregates
+        self.energy_type = None
         
         # Container for chart+table and listbox side by side
         bar_content_frame = ttk.Frame(self)
@@ -86,17 +88,19 @@ class BarChart(tk.Frame):
         listbox_label = ttk.Label(listbox_container, text="Select Experiments:")
         listbox_label.pack(pady=(0, 5))
 
+        # Filled in by refresh() once the statistics view has loaded the results
         self.bar_exp_listbox = tk.Listbox(listbox_container, selectmode=tk.MULTIPLE, exportselection=False, height=12)
-        for exp in sorted(self.df['Experiment'].unique()):
-            self.bar_exp_listbox.insert(tk.END, exp)
         self.bar_exp_listbox.pack()
 
-        if self.bar_exp_listbox.size() > 0:
-            self.bar_exp_listbox.selection_set(0)
-
         self.bar_exp_listbox.bind("<<ListboxSelect>>", lambda e: self.update())
 
-        self.bar_canvas = None
+        # Figure and canvas are created once; updates change the bars in place
+        self.figure = Figure(figsize=(6, 6))
+        self.ax = self.figure.add_subplot()
+        self.bar_canvas = FigureCanvasTkAgg(self.figure, master=self.bar_chart_frame)
+        self.bar_canvas.get_tk_widget().pack(pady=10, fill='both', expand=True)
+        self.bar_layout = None  # (experiments, tasks) of the drawn bars
+        self.bars = {}
         
         def _on_mousewheel(event):
             if event.num == 4:  # macOS scroll up
@@ -135,21 +139,26 @@ class BarChart(tk.Frame):
         _bind_mousewheel(scrollable_frame)
 
 
-    def update(self, energy_type = None, df = None):
+    def refresh(self, energy_type, experiments, changed_experiments):
+        """
+        Update the experiment list after new results arrived, redrawing only if
+        one of the displayed experiments changed.
+        """
+        self.energy_type = energy_type or self.energy_type
+        self._refresh_experiment_list(experiments)
+        if self.bar_layout is None or set(self._get_selected_experiments()) & set(changed_experiments):
+            self.update()
+
+    def update(self, energy_type = None):
         if energy_type:
             self.energy_type = energy_type
-        if df is not None:
-            self.df = df
-            self._refresh_experiment_list()
         selected_exps = self._get_selected_experiments()
-        if not selected_exps or not self.energy_type or self.df is None:
+        if not selected_exps or not self.energy_type:
             return
         
         grouped, y_label, sum_data = self._extract_data(selected_exps, self.energy_type)
         
-        if self.bar_canvas:
-            self.bar_canvas.get_tk_widget().destroy()
-        self._plot_chart(energy_type, grouped, y_label)
+        self._plot_chart(self.energy_type, grouped, y_label)
         self._plot_table(sum_data)
         
 
@@ -159,55 +168,68 @@ class BarChart(tk.Frame):
         return selected_exps
 
     def _extract_data(self, selected_exps, energy_type):
-        bar_data = self.df[self.df['Experiment'].isin(selected_exps)]
-        if energy_type == 'CPU Energy':
-            grouped = bar_data.groupby(['Experiment', 'Task'])['CPU Energy'].mean().reset_index()
-            y_label = 'CPU Energy'
-            sum_data = bar_data.groupby('Experiment')['CPU Energy'].sum()
-        elif energy_type == 'RAM Energy':
-            grouped = bar_data.groupby(['Experiment', 'Task'])['RAM Energy'].mean().reset_index()
-            y_label = 'RAM Energy'
-            sum_data = bar_data.groupby('Experiment')['RAM Energy'].sum()
-        else:
-            bar_data = bar_data.copy()
-            bar_data['Total Energy'] = bar_data['CPU Energy'] + bar_data['RAM Energy']
-            grouped = bar_data.groupby(['Experiment', 'Task'])['Total Energy'].mean().reset_index()
-            y_label = 'Total Energy'
-            sum_data = bar_data.groupby('Experiment')['Total Energy'].sum()
+        grouped, y_label = self.aggregates.task_energy(selected_exps, energy_type)
+        sum_data = self.aggregates.experiment_totals(selected_exps, energy_type)
         return grouped, y_label, sum_data
 
 
-    def _refresh_experiment_list(self):
-        # Clear and repopulate the experiment listbox
+    def _refresh_experiment_list(self, experiments):
+        # Repopulate the experiment listbox, keeping the current selection
+        if list(self.bar_exp_listbox.get(0, tk.END)) == list(experiments):
+            return
+        selected_exps = set(self._get_selected_experiments())
         self.bar_exp_listbox.delete(0, tk.END)
-        for exp in sorted(self.df['Experiment'].unique()):
+        for i, exp in enumerate(experiments):
             self.bar_exp_listbox.insert(tk.END, exp)
+            if exp in selected_exps:
+                self.bar_exp_listbox.selection_set(i)
 
-        if self.bar_exp_listbox.size() > 0:
+        if not self.bar_exp_listbox.curselection() and self.bar_exp_listbox.size() > 0:
             self.bar_exp_listbox.selection_set(0)
 
     def _plot_chart(self, energy_type, grouped, y_label):
         energy_type = self.energy_type
-        n_experiments = grouped['Experiment'].nunique()
-        n_tasks = grouped['Task'].nunique()
+        experiments = tuple(dict.fromkeys(grouped['Experiment']))
+        tasks = tuple(sorted(grouped['Task'].unique()))
+        heights = grouped.pivot(index='Task', columns='Experiment', values=y_label).reindex(index=list(tasks), columns=list(experiments))
+
+        # Same experiments and tasks as drawn: only the bar heights change
+        if (experiments, tasks) != self.bar_layout:
+            self._build_bars(experiments, tasks)
+        for exp in experiments:
+            for rect, height in zip(self.bars[exp], heights[exp].fillna(0)):
+                rect.set_height(height)
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_title(f"{energy_type} by Task across Experiments", pad=10)
+        self.ax.set_ylabel(y_label)
+        self.bar_canvas.draw_idle()
+
+    def _build_bars(self, experiments, tasks):
+        n_experiments = len(experiments)
+        n_tasks = len(tasks)
         width = max(6, n_tasks * n_experiments * 0.1)
         height = 6
 
-        fig, ax = plt.subplots(figsize=(width, height))
-        sns.barplot(data=grouped, x='Task', y=y_label, hue='Experiment', palette="pastel", ax=ax)
-
-        ax.set_title(f"{energy_type} by Task across Experiments", pad=10)
-        ax.set_xlabel("Task")
-        ax.set_ylabel(y_label)
-        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
-
-        plt.tight_layout(pad=1.0)  # Minimize surrounding whitespace
-        fig.subplots_adjust(top=0.92, bottom=0.25, left=0.08, right=0.95)
-
-        self.bar_canvas = FigureCanvasTkAgg(fig, master=self.bar_chart_frame)
-        self.bar_canvas.draw()
-        self.bar_canvas.get_tk_widget().pack(pady=10, fill='both', expand=True)
-        plt.close(fig)
+        self.figure.set_size_inches(width, height)
+        self.bar_canvas.get_tk_widget().config(width=int(width * self.figure.dpi), height=int(height * self.figure.dpi))
+
+        self.ax.clear()
+        colors = sns.color_palette("pastel")
+        bar_width = 0.8 / max(n_experiments, 1)
+        x = np.arange(n_tasks)
+        self.bars = {
+            exp: self.ax.bar(x - 0.4 + bar_width * (i + 0.5), np.zeros(n_tasks), bar_width,
+                             label=exp, color=colors[i % len(colors)])
+            for i, exp in enumerate(experiments)
+        }
+        self.ax.set_xticks(x, tasks, rotation=45, ha='right')
+        self.ax.set_xlabel("Task")
+        self.ax.legend(title="Experiment")
+
+        self.figure.subplots_adjust(top=0.92, bottom=0.25, left=0.08, right=0.95)
+        self.bar_layout = (experiments, tasks)
 
     def _plot_table(self, sum_data):
         for row in self.table.get_children():
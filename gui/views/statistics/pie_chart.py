@@ -3,48 +3,68 @@ from tkinter import ttk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib
 matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import numpy as np
 import seaborn as sns
 
 sns.set_theme(style="whitegrid")
 
 class PieChart(tk.Frame):
-    def __init__(self, parent, df):
+    def __init__(self, parent, aggregates):
         super().__init__(parent)
-        self.df = df
+        self.aggregates = aggregates
         self.energy_type = None
 
         ttk.Label(self, text="Select Experiment:").pack(pady=(10, 0))
         self.pie_exp_var = tk.StringVar()
+        # Filled in by refresh() once the statistics view has loaded the results
         self.pie_exp_dropdown = ttk.Combobox(self, textvariable=self.pie_exp_var, state="readonly")
-        self.pie_exp_dropdown['values'] = sorted(self.df['Experiment'].unique())
-
-        if self.pie_exp_dropdown['values']:
-            self.pie_exp_dropdown.current(0)
 
         # self.pie_exp_dropdown.current(0)
         self.pie_exp_dropdown.pack(pady=5)
-        self.pie_exp_dropdown.bind("<<ComboboxSelected>>", lambda e: self.update(self.energy_type, self.df))
+        self.pie_exp_dropdown.bind("<<ComboboxSelected>>", lambda e: self.update(self.energy_type))
 
-        self.pie_canvas = None
+        # Figure and canvas are created once; updates change the wedges in place
+        self.figure = Figure(figsize=(8, 4), dpi=100, constrained_layout=False)
+        self.ax = self.figure.add_subplot()
+        self.ax.axis('off')
+        self.pie_canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.pie_canvas.get_tk_widget().pack(pady=10, fill='both', expand=True)
+        self.drawn = False
+        self.pie_tasks = None  # tasks of the drawn wedges
+        self.wedges = []
+        self.autotexts = []
+        self.legend = None
         
-    def update(self, energy_type = None, df = None):
+    def refresh(self, energy_type, experiments, changed_experiments):
+        """
+        Update the experiment list after new results arrived, redrawing only if
+        the displayed experiment changed.
+        """
+        self.energy_type = energy_type or self.energy_type
+        self._refresh_experiment_list(experiments)
+        if not self.drawn or self._get_selected_experiment() in changed_experiments:
+            self.update()
+
+    def update(self, energy_type = None):
         if energy_type:
             self.energy_type = energy_type
-        if df is not None:
-            self.df = df
         selected_exp = self._get_selected_experiment()
-        if not selected_exp or not self.energy_type or self.df is None:
+        if not selected_exp or not self.energy_type:
             return
 
         avg_energy = self._extract_data(selected_exp)
             
-        if self.pie_canvas:
-            self.pie_canvas.get_tk_widget().destroy()
         self._plot_chart(selected_exp, avg_energy)
+        self.drawn = True
 
-        self.pie_exp_dropdown['values'] = sorted(self.df['Experiment'].unique())
-        if self.pie_exp_dropdown['values']:
+    def _refresh_experiment_list(self, experiments):
+        # Keep the current selection if it still exists
+        selected_exp = self._get_selected_experiment()
+        self.pie_exp_dropdown['values'] = experiments
+        if selected_exp in experiments:
+            self.pie_exp_dropdown.current(experiments.index(selected_exp))
+        elif experiments:
             self.pie_exp_dropdown.current(0)
 
     def _get_selected_experiment(self):
@@ -52,42 +72,45 @@ class PieChart(tk.Frame):
         return selected_exp
 
     def _extract_data(self, selected_exp):
-        exp_df = self.df[self.df['Experiment'] == selected_exp]
-        if self.energy_type == 'CPU Energy':
-            avg_energy = exp_df.groupby('Task')['CPU Energy'].mean()
-        elif self.energy_type == 'RAM Energy':
-            avg_energy = exp_df.groupby('Task')['RAM Energy'].mean()
-        else:
-            exp_df = exp_df.copy()
-            exp_df['Total Energy'] = exp_df['CPU Energy'] + exp_df['RAM Energy']
-            avg_energy = exp_df.groupby('Task')['Total Energy'].mean()
-        return avg_energy
+        grouped, label = self.aggregates.task_energy([selected_exp], self.energy_type)
+        return grouped.set_index('Task')[label]
 
     def _plot_chart(self, selected_exp, avg_energy):
-        fig, ax = plt.subplots(figsize=(8, 4), dpi=100, constrained_layout=False)
-
         # Check for negative values
         if (avg_energy < 0).any():
             print("Skipping pie chart: data contains negative values.")
             self._show_message("Cannot plot: Data contains negative values.")
-            plt.close(fig)
             return
 
         # Check for empty or all zero data
         if avg_energy.empty or avg_energy.isna().all() or avg_energy.sum() == 0:
             print("Skipping pie chart: data is empty, all NaN, or zero.")
             self._show_message("No valid data to plot.")
-            plt.close(fig)
             return
 
+        total = avg_energy.sum()
+        labels = [
+            f"{task} ({energy / total * 100:.1f}%) - {energy:.2f} J"
+            for task, energy in avg_energy.items()
+        ]
+
+        # Same tasks as drawn: only the wedge angles and labels change
+        tasks = tuple(avg_energy.index)
+        if tasks != self.pie_tasks:
+            self._build_pie(avg_energy, labels)
+        else:
+            self._update_wedges(avg_energy, labels)
+
+        self.ax.set_title(f"{self.energy_type} - {selected_exp}")
+        self.pie_canvas.draw_idle()
+
+    def _build_pie(self, avg_energy, labels):
+        self._clear()
+
         base_colors = sns.color_palette("pastel")
         colors = base_colors * (len(avg_energy) // len(base_colors) + 1)
 
-        if avg_energy.empty or avg_energy.isna().all() or avg_energy.sum() == 0:
-            print("Skipping pie chart: data is empty, all NaN, or zero.")
-            return
-
-        wedges, _, autotexts = ax.pie(
+        self.wedges, _, self.autotexts = self.ax.pie(
             avg_energy,
             labels=None,
             autopct='%1.1f%%',
@@ -96,24 +119,17 @@ class PieChart(tk.Frame):
             pctdistance=0.8
         )
 
-        for autotext in autotexts:
+        for autotext in self.autotexts:
             autotext.set_fontsize(8)
 
-        total = avg_energy.sum()
-        labels = [
-            f"{task} ({energy / total * 100:.1f}%) - {energy:.2f} J"
-            for task, energy in avg_energy.items()
-        ]
-
         #Move pie chart to the left
-        ax.set_position([0.0, 0.1, 0.6, 0.8])  # (left, bottom, width, height)
+        self.ax.set_position([0.0, 0.1, 0.6, 0.8])  # (left, bottom, width, height)
 
-        ax.axis('equal')
-        ax.set_title(f"{self.energy_type} - {selected_exp}")
+        self.ax.axis('equal')
 
         #Add legend to the figure
-        fig.legend(
-            wedges,
+        self.legend = self.figure.legend(
+            self.wedges,
             labels,
             title="Tasks",
             loc='center right',
@@ -121,22 +137,36 @@ class PieChart(tk.Frame):
             frameon=False,
             borderaxespad=0.5
         )
-
-        self.pie_canvas = FigureCanvasTkAgg(fig, master=self)
-        self.pie_canvas.draw()
-        self.pie_canvas.get_tk_widget().pack(pady=10, fill='both', expand=True)
-        plt.close(fig)
+        self.pie_tasks = tuple(avg_energy.index)
+
+    def _update_wedges(self, avg_energy, labels):
+        # Same geometry as Axes.pie: counterclockwise from startangle=90, unit radius
+        fractions = avg_energy.to_numpy(dtype=float) / avg_energy.sum()
+        theta1 = 90 + 360 * np.concatenate([[0.0], np.cumsum(fractions)[:-1]])
+        theta2 = theta1 + 360 * fractions
+
+        for wedge, autotext, start, end, fraction in zip(self.wedges, self.autotexts, theta1, theta2, fractions):
+            wedge.set_theta1(start)
+            wedge.set_theta2(end)
+            middle = np.deg2rad((start + end) / 2)
+            autotext.set_position((0.8 * np.cos(middle), 0.8 * np.sin(middle)))
+            autotext.set_text(f"{fraction * 100:1.1f}%")
+
+        for text, label in zip(self.legend.get_texts(), labels):
+            text.set_text(label)
+
+    def _clear(self):
+        if self.legend is not None:
+            self.legend.remove()
+            self.legend = None
+        self.ax.clear()
+        self.pie_tasks = None
+        self.wedges = []
+        self.autotexts = []
 
     def _show_message(self, message):
-        if self.pie_canvas:
-            self.pie_canvas.get_tk_widget().destroy()
-
-        # Create a new blank figure with the message
-        fig, ax = plt.subplots()
-        ax.text(0.5, 0.5, message, horizontalalignment='center', verticalalignment='center', fontsize=12)
-        ax.axis('off')
-
-        self.pie_canvas = FigureCanvasTkAgg(fig, master=self)
-        self.pie_canvas.draw()
-        self.pie_canvas.get_tk_widget().pack(pady=10, fill='both', expand=True)
-        plt.close(fig)
+        self._clear()
+        self.ax.set_position([0.0, 0.0, 1.0, 1.0])
+        self.ax.text(0.5, 0.5, message, horizontalalignment='center', verticalalignment='center', fontsize=12)
+        self.ax.axis('off')
+        self.pie_canvas.draw_idle()
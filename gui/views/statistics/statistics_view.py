@@ -1,30 +1,25 @@
 import tkinter as tk
 from tkinter import ttk
-import pandas as pd
-import os
 
+from logic.results_store import open_results_store
+from gui.views.statistics.aggregation import EnergyAggregates
 from gui.views.statistics.bar_chart import BarChart
 from gui.views.statistics.pie_chart import PieChart
 
+POLL_INTERVAL_MS = 2000
+
 class StatisticsView(tk.Frame):
 
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
 
-        csv_path = "results/all_experiments_summary.csv"
-
-        # Create the CSV file with headers if it doesn't exist
-        if not os.path.exists(csv_path):
-            os.makedirs(os.path.dirname(csv_path), exist_ok=True)
-            pd.DataFrame(columns=['Experiment', 'Task', 'Run', 'CPU Energy', 'CPU Idle', 'CPU Compensation', 'RAM Energy']).to_csv(csv_path,
-                                                                                                   index=False)
-        # DataFrame Setup
-        try:
-            self.df = pd.read_csv(csv_path)
-        except Exception as e:
-            print(f"Error loading CSV: {e}")
-            self.df = pd.DataFrame(columns=['Experiment', 'Task', 'Run', 'CPU Energy', 'CPU Idle', 'CPU Compensation', 'RAM Energy'])
+        # Results store, importing the legacy summary CSV on first use
+        self.store = open_results_store()
+        self.aggregates = EnergyAggregates(self.store)
+        # Last store revision loaded, and all experiments seen so far
+        self.revision = 0
+        self.experiments = set()
 
         self.grid_rowconfigure(2, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -51,7 +46,7 @@ class StatisticsView(tk.Frame):
         self.energy_dropdown = ttk.Combobox(selector_frame, textvariable=self.energy_type_var, values=energy_options, state="readonly", width=15)
         self.energy_dropdown.current(0)
         self.energy_dropdown.pack(side="left")
-        self.energy_dropdown.bind("<<ComboboxSelected>>", self.update)
+        self.energy_dropdown.bind("<<ComboboxSelected>>", self.change_energy_type)
 
         # Notebook Tabs
         notebook = ttk.Notebook(self)
@@ -65,19 +60,19 @@ class StatisticsView(tk.Frame):
         bar_tab.grid_rowconfigure(0, weight=1)
         bar_tab.grid_columnconfigure(0, weight=1)
 
-        self.pie_view = PieChart(pie_tab, self.df)
+        self.pie_view = PieChart(pie_tab, self.aggregates)
         self.pie_view.pack(fill="both", expand=True)
-        self.bar_view = BarChart(bar_tab, self.df)
+        self.bar_view = BarChart(bar_tab, self.aggregates)
         self.bar_view.pack(fill="both", expand=True)
 
-        # Reload CSV Button
+        # Reload Button
         bottom_frame = ttk.Frame(self)
         bottom_frame.grid(row=3, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
 
         self.reload_status = ttk.Label(bottom_frame, text="", foreground="green")
         self.reload_status.pack(side="left")
 
-        reload_btn = ttk.Button(bottom_frame, text="Reload CSV", command=self.update)
+        reload_btn = ttk.Button(bottom_frame, text="Reload Results", command=self.update)
         reload_btn.pack(side="right")
 
         # Reload status label (MUST be before calling self.update())
@@ -85,17 +80,44 @@ class StatisticsView(tk.Frame):
         self.reload_status.grid(row=3, column=0, sticky="w", padx=10, pady=(0, 5))
 
         self.update()
+        self.after(POLL_INTERVAL_MS, self.poll)
 
     def update(self, event=None):
-        csv_path = "results/all_experiments_summary.csv"
+        """
+        Load only the results stored since the last reload and redraw the charts showing them.
+        """
         try:
-            self.df = pd.read_csv(csv_path)
-            self.reload_status.config(text="CSV successfully loaded.")
+            changes = self.store.changes_since(self.revision)
         except Exception as e:
-            print(f"Error loading CSV: {e}")
-            self.df = pd.DataFrame(columns=['Experiment', 'Task', 'Run', 'CPU Energy', 'CPU Idle', 'CPU Compensation', 'RAM Energy'])
-            self.reload_status.config(text="Failed to reload CSV.")
+            print(f"Error loading results: {e}")
+            self.reload_status.config(text="Failed to reload results.")
+            return
+
+        if changes.empty:
+            self.reload_status.config(text="Results up to date.")
+            return
+
+        self.revision = int(changes['Revision'].max())
+        changed_experiments = set(changes['Experiment'])
+        self.experiments |= changed_experiments
+        self.aggregates.invalidate(changed_experiments)
+        experiments = sorted(self.experiments)
 
         energy_type = self.energy_type_var.get()
-        self.pie_view.update(energy_type, self.df)
-        self.bar_view.update(energy_type, self.df)
+        self.pie_view.refresh(energy_type, experiments, changed_experiments)
+        self.bar_view.refresh(energy_type, experiments, changed_experiments)
+        self.reload_status.config(text=f"Loaded {len(changes)} new results.")
+
+    def change_energy_type(self, event=None):
+        energy_type = self.energy_type_var.get()
+        self.pie_view.update(energy_type)
+        self.bar_view.update(energy_type)
+
+    def poll(self):
+        # Pick up results written by a running experiment
+        try:
+            if self.store.has_changed():
+                self.update()
+        except Exception as e:
+            print(f"Error polling results: {e}")
+        self.after(POLL_INTERVAL_MS, self.poll)
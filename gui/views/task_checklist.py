@@ -0,0 +1,162 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class TaskChecklist(ttk.Frame):
+    """
+    Scrollable checklist that only creates checkboxes for the rows that fit on screen.
+    Scrolling re-labels the same widgets; which tasks are selected is kept in a set,
+    so the list can hold tens of thousands of tasks.
+    """
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.tasks = []         # all tasks, in discovery order
+        self.selected = set()   # selected task names
+        self.visible = []       # tasks shown under the current filter
+        self.filter_text = ""
+        self.top = 0            # index in visible of the first row on screen
+
+        self.rows_frame = tk.Frame(self, bg="white")
+        self.rows_frame.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.rows = []          # (checkbutton, variable) pool, one per row on screen
+        self.row_tasks = []     # task currently shown in each row
+        self.row_height = None
+
+        self.rows_frame.bind("<Configure>", lambda e: self._resize(e.height))
+        self._bind_mousewheel(self.rows_frame)
+
+    # Content
+
+    def clear(self):
+        self.tasks = []
+        self.selected = set()
+        self.visible = []
+        self.top = 0
+        self._redraw()
+
+    def add_tasks(self, tasks, selected=()):
+        """
+        Append tasks, selecting those in selected. Only rows on screen are redrawn.
+        """
+        self.tasks.extend(tasks)
+        self.selected.update(selected)
+        first_new = len(self.visible)
+        self.visible.extend(task for task in tasks if self._matches(task, self.filter_text))
+        if first_new < self.top + len(self.rows):
+            self._redraw()
+        else:
+            self._update_scrollbar()
+
+    def set_filter(self, text):
+        """
+        Show only the tasks containing text ('' or '*' shows all). When the new text
+        extends the previous one, only the currently visible tasks are searched.
+        """
+        text = text.strip().lower()
+        if text == self.filter_text:
+            return
+        if self.filter_text and self.filter_text != "*" and self.filter_text in text:
+            candidates = self.visible
+        else:
+            candidates = self.tasks
+        self.visible = [task for task in candidates if self._matches(task, text)]
+        self.filter_text = text
+        self.top = 0
+        self._redraw()
+
+    @staticmethod
+    def _matches(task, text):
+        return not text or text == "*" or text in task.lower()
+
+    # Selection
+
+    def select_matching(self, text):
+        """
+        Select every task containing text, or all tasks for '*'.
+        """
+        text = text.strip().lower()
+        if text:
+            self.selected.update(task for task in self.tasks if self._matches(task, text))
+            self._redraw()
+
+    def deselect_all(self):
+        self.selected.clear()
+        self._redraw()
+
+    def selected_tasks(self):
+        return [task for task in self.tasks if task in self.selected]
+
+    def _toggle(self, row):
+        task = self.row_tasks[row]
+        if task is None:
+            return
+        if self.rows[row][1].get():
+            self.selected.add(task)
+        else:
+            self.selected.discard(task)
+
+    # Rendering
+
+    def _resize(self, height):
+        if self.row_height is None:
+            self._add_row()
+            self.row_height = max(1, self.rows[0][0].winfo_reqheight())
+        needed = max(1, height // self.row_height)
+        while len(self.rows) < needed:
+            self._add_row()
+        while len(self.rows) > needed:
+            checkbutton, _ = self.rows.pop()
+            self.row_tasks.pop()
+            checkbutton.destroy()
+        self._redraw()
+
+    def _add_row(self):
+        row = len(self.rows)
+        var = tk.IntVar(value=0)
+        checkbutton = ttk.Checkbutton(self.rows_frame, variable=var, style="task.TCheckbutton",
+                                      command=lambda: self._toggle(row))
+        checkbutton.pack(anchor="nw", fill="x")
+        self._bind_mousewheel(checkbutton)
+        self.rows.append((checkbutton, var))
+        self.row_tasks.append(None)
+
+    def _redraw(self):
+        self.top = max(0, min(self.top, len(self.visible) - len(self.rows)))
+        for i, (checkbutton, var) in enumerate(self.rows):
+            index = self.top + i
+            task = self.visible[index] if index < len(self.visible) else None
+            self.row_tasks[i] = task
+            var.set(1 if task in self.selected else 0)
+            checkbutton.config(text=task or "", state="normal" if task else "disabled")
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = max(len(self.visible), 1)
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + len(self.rows)) / total))
+
+    # Scrolling
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.visible))
+        elif args[0] == "scroll":
+            step = len(self.rows) if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self._redraw()
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            self.yview("scroll", -1, "units")
+        elif event.num == 5:
+            self.yview("scroll", 1, "units")
+        else:
+            self.yview("scroll", int(-1 * (event.delta / 120)) or (-1 if event.delta > 0 else 1), "units")
+
+    def _bind_mousewheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", self._on_mousewheel)
+        widget.bind("<Button-5>", self._on_mousewheel)
@@ -0,0 +1,220 @@
+# logic/binary_trace.py
+
+"""
+Compact columnar copy of an EnergiBridge results.csv: a small JSON header followed by one
+fixed-dtype array per column. Readers memory-map the file, so slicing a time range or
+integrating energy doesn't parse any text or copy any samples.
+
+Layout: MAGIC, the header length as a little-endian uint64, the JSON header, then the
+column arrays, each aligned to ALIGNMENT bytes at the offset given in the header
+(relative to the first aligned offset after the header).
+"""
+
+import json
+import mmap
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from logic.energibridge_csv import (
+    COLUMN_DTYPES, compute_energies, counter_intervals, detect_schema, energy_columns, read_energy_trace, read_header,
+)
+from logic.energy_cache import file_fingerprint
+
+MAGIC = b"EBTRACE1"
+ALIGNMENT = 64
+TRACE_SUFFIX = ".trace"
+MEMORY_COLUMNS = ("USED_MEMORY", "TOTAL_MEMORY", "USED_SWAP", "TOTAL_SWAP")
+
+
+def trace_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + TRACE_SUFFIX
+
+
+def column_dtype(name):
+    """
+    Storage dtype of a column: the dtype energy computations load it with, 64-bit integers
+    for memory sizes and float32 for the other readings.
+    """
+    if name in COLUMN_DTYPES:
+        return np.dtype(COLUMN_DTYPES[name])
+    if name in MEMORY_COLUMNS:
+        return np.dtype("int64")
+    return np.dtype("float32")
+
+
+def read_samples(csv_path):
+    """
+    Parse every column of an EnergiBridge CSV with its storage dtype, or with pandas'
+    inferred dtypes if some column doesn't fit (missing or non-numeric values).
+    """
+    try:
+        return pd.read_csv(csv_path, dtype={name: column_dtype(name) for name in read_header(csv_path)})
+    except (ValueError, TypeError):
+        return pd.read_csv(csv_path)
+
+
+def write_trace(csv_path, trace_path=None, df=None, source=None):
+    """
+    Convert an EnergiBridge CSV to the binary format, from df if it was already parsed (with
+    source, the fingerprint of the CSV it was parsed from). Non-numeric columns are dropped.
+    The file is replaced atomically. Returns the path of the trace.
+    """
+    trace_path = trace_path or trace_path_for(csv_path)
+    if df is None:
+        source = file_fingerprint([csv_path])
+        df = read_samples(csv_path)
+
+    columns, arrays, offset = [], [], 0
+    for name in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[name]):
+            continue
+        dtype = column_dtype(name)
+        if dtype.kind == "i" and df[name].isna().any():
+            dtype = np.dtype("float64")
+        array = np.ascontiguousarray(df[name].to_numpy(dtype=dtype))
+        columns.append({"name": name, "dtype": dtype.str, "offset": offset})
+        arrays.append(array)
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = {"version": 1, "rows": len(df), "source": source, "columns": columns}
+    encoded = json.dumps(header).encode("utf-8")
+    # A unique name, as the live ingestion and a summary may convert the same CSV at once
+    fd, temporary = tempfile.mkstemp(prefix=os.path.basename(trace_path), suffix=".tmp", dir=os.path.dirname(trace_path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(encoded).to_bytes(8, "little"))
+            f.write(encoded)
+            data_start = data_offset(len(encoded))
+            for column, array in zip(columns, arrays):
+                f.write(b"\0" * (data_start + column["offset"] - f.tell()))
+                f.write(array.tobytes())
+        os.replace(temporary, trace_path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return trace_path
+
+
+def data_offset(header_length):
+    """
+    Where the column arrays start: the first aligned offset after the header.
+    Column offsets in the header are relative to it.
+    """
+    return -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+
+
+def read_trace_header(trace_path):
+    with open(trace_path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{trace_path} is not a binary trace")
+        length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(length))
+    header["data_offset"] = data_offset(length)
+    return header
+
+
+def is_current(trace_path, csv_path):
+    """
+    Whether trace_path exists and was converted from the current content of csv_path.
+    """
+    try:
+        return read_trace_header(trace_path)["source"] == file_fingerprint([csv_path])
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def ensure_trace(csv_path):
+    """
+    Convert csv_path unless an up-to-date binary trace exists. Returns the trace path, or None
+    if the CSV can't be converted.
+    """
+    trace_path = trace_path_for(csv_path)
+    if is_current(trace_path, csv_path):
+        return trace_path
+    try:
+        return write_trace(csv_path, trace_path)
+    except Exception as e:
+        print(f"Failed to convert {csv_path} to a binary trace: {e}")
+        return None
+
+
+class BinaryTrace:
+    """
+    A memory-mapped binary trace. Columns are read-only numpy views into the mapping.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = read_trace_header(path)
+        self.rows = self.header["rows"]
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.columns = {
+            column["name"]: np.frombuffer(
+                self.buffer, dtype=column["dtype"], count=self.rows, offset=self.header["data_offset"] + column["offset"]
+            )
+            for column in self.header["columns"]
+        }
+        self.schema = detect_schema(list(self.columns))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def time_range(self, start, end):
+        """
+        The rows sampled between start and end (ms timestamps), as a slice.
+        """
+        times = self.columns["Time"]
+        return slice(int(np.searchsorted(times, start, side="left")), int(np.searchsorted(times, end, side="right")))
+
+    def frame(self, columns=None, rows=slice(None)):
+        """
+        A DataFrame over the given columns (all by default) and rows, backed by the mapping.
+        """
+        columns = columns or list(self.columns)
+        return pd.DataFrame({name: self.columns[name][rows] for name in columns}, copy=False)
+
+    def energies(self, rows=slice(None), counter_ranges=None):
+        """
+        CPU energy (J), RAM energy (J) and run time (s) of the given rows, as compute_energies.
+        """
+        return compute_energies(self.frame(energy_columns(self.schema), rows), self.schema, counter_ranges)
+
+    def cpu_intervals(self, rows=slice(None), max_range=None):
+        """
+        Energy (J) of every sample interval of the given rows.
+        """
+        if self.schema["cpu_energy"]:
+            return counter_intervals(self.columns[self.schema["cpu_energy"]][rows], max_range)
+        power = self.columns[self.schema["cpu_power"]][rows].astype("float64")[1:]
+        return power * np.diff(self.columns["Time"][rows].astype("float64")) / 1_000
+
+
+def load_energy_trace(csv_path, convert=False):
+    """
+    Like read_energy_trace, but reads the binary trace next to csv_path if it is up to date.
+    With convert, a missing or outdated trace is written from the same parse of the CSV.
+    """
+    trace_path = trace_path_for(csv_path)
+    if is_current(trace_path, csv_path):
+        trace = BinaryTrace(trace_path)
+        return trace.frame(energy_columns(trace.schema)), trace.schema
+    if not convert:
+        return read_energy_trace(csv_path)
+
+    source = file_fingerprint([csv_path])
+    df = read_samples(csv_path)
+    try:
+        write_trace(csv_path, trace_path, df, source)
+    except Exception as e:
+        print(f"Failed to convert {csv_path} to a binary trace: {e}")
+    schema = detect_schema(list(df.columns))
+    return df[energy_columns(schema)], schema
@@ -0,0 +1,201 @@
+# logic/cli.py
+
+"""
+Headless command-line interface to the experiment runner.
+
+    python -m logic run --repo PATH --energibridge PATH --tasks :app:build :lib:test --iterations 30
+    python -m logic run --repo PATH --backend rapl --tasks :app:build --iterations 30
+    python -m logic resume EXPERIMENT_DIR
+    python -m logic tasks --repo PATH [--command build] [--refresh]
+    python -m logic summarize EXPERIMENT_DIR [--workers N]
+
+Progress is written to stdout as JSON lines; the runner's own log goes to stderr.
+Loads no GUI or plotting modules.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import queue
+import sys
+import time
+
+from logic import experiment_setup
+from logic.cooldown import DEFAULT_TOLERANCE, RAPL_ROOT
+from logic.events import CallbackSink, JsonLinesSink, MultiSink, TaskFinished
+from logic.idle_baseline import DEFAULT_MAX_AGE, DEFAULT_SAMPLE_INTERVAL
+from logic.journal import JOURNAL_FILE
+from logic.rapl_sampler import DEFAULT_SAMPLE_INTERVAL as DEFAULT_RAPL_INTERVAL
+from logic.stopping import DEFAULT_CI_WIDTH, DEFAULT_CONFIDENCE, DEFAULT_MIN_ITERATIONS
+
+EXIT_OK = 0
+EXIT_TASK_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def emit(event):
+    """
+    Write one machine-readable progress event to stdout.
+    """
+    print(json.dumps({"event": event.pop("event"), "time": time.time(), **event}), file=sys.__stdout__, flush=True)
+
+
+def configure_paths(args):
+    if not os.path.isdir(args.repo):
+        emit({"event": "error", "message": f"Gradle project not found: {args.repo}"})
+        return False
+    experiment_setup.set_gradle_repository_path(os.path.abspath(args.repo))
+    energibridge = getattr(args, "energibridge", None)
+    if energibridge is not None and experiment_setup.set_energibridge_path(os.path.abspath(energibridge)) is None:
+        emit({"event": "error", "message": f"EnergiBridge executable not found: {energibridge}"})
+        return False
+    return True
+
+
+def configure_backend(args):
+    if args.backend == experiment_setup.ENERGIBRIDGE_BACKEND and args.energibridge is None:
+        emit({"event": "error", "message": "--energibridge is required with the energibridge backend"})
+        return False
+    if experiment_setup.set_measurement_backend(args.backend, args.sample_interval / 1000, args.rapl_root) is None:
+        emit({"event": "error", "message": f"No readable RAPL energy counters under {args.rapl_root}"})
+        return False
+    return True
+
+
+def run_with_events(args, start):
+    """
+    Call start(sink) with stdout (and --log) as event sinks. Returns the exit code.
+    """
+    failed_tasks = []
+
+    def track_failures(event):
+        if isinstance(event, TaskFinished) and event.returncode != 0:
+            failed_tasks.append(event)
+
+    sink = MultiSink(
+        JsonLinesSink(sys.__stdout__),
+        JsonLinesSink(args.log) if args.log else None,
+        CallbackSink(track_failures),
+    )
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            start(sink)
+    finally:
+        sink.close()
+    return EXIT_TASK_FAILED if failed_tasks else EXIT_OK
+
+
+def run_command(args):
+    if not configure_backend(args) or not configure_paths(args):
+        return EXIT_USAGE
+
+    return run_with_events(args, lambda sink: experiment_setup.run_experiment(
+        args.name, args.iterations, args.timeout_repetitions, args.timeout_tasks, args.warmup,
+        args.tasks, queue.Queue(), single_build=args.single_build, sink=sink,
+        adaptive_cooldown=args.adaptive_cooldown, cooldown_tolerance=args.cooldown_tolerance,
+        warmup_cores=args.warmup_cores, adaptive_iterations=args.adaptive_iterations,
+        min_iterations=args.min_iterations, ci_width=args.ci_width, confidence=args.confidence,
+        idle_max_age=args.idle_max_age, idle_sample_interval=args.idle_interval
+    ))
+
+
+def resume_command(args):
+    if not os.path.isfile(os.path.join(args.experiment_dir, JOURNAL_FILE)):
+        emit({"event": "error", "message": f"No experiment journal in {args.experiment_dir}"})
+        return EXIT_USAGE
+
+    return run_with_events(args, lambda sink: experiment_setup.resume_experiment(
+        os.path.abspath(args.experiment_dir), queue.Queue(), sink=sink
+    ))
+
+
+def tasks_command(args):
+    if not configure_paths(args):
+        return EXIT_USAGE
+    with contextlib.redirect_stdout(sys.stderr):
+        tasks = experiment_setup.get_tasks_cached(args.command, refresh=args.refresh)
+    emit({"event": "tasks_found", "command": args.command, "tasks": tasks})
+    return EXIT_OK if tasks else EXIT_TASK_FAILED
+
+
+def summarize_command(args):
+    if not os.path.isdir(args.experiment_dir):
+        emit({"event": "error", "message": f"Experiment directory not found: {args.experiment_dir}"})
+        return EXIT_USAGE
+    # pandas is only needed here
+    from logic.experiment_summary import extract_and_append_summary
+    with contextlib.redirect_stdout(sys.stderr):
+        extract_and_append_summary(os.path.abspath(args.experiment_dir), workers=args.workers)
+    emit({"event": "summary_finished", "directory": os.path.abspath(args.experiment_dir)})
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m logic", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command_name", required=True)
+
+    run = subparsers.add_parser("run", help="run an experiment")
+    run.add_argument("--repo", required=True, help="directory of the Gradle project")
+    run.add_argument("--energibridge", default=None, help="path of the energibridge executable")
+    run.add_argument("--backend", choices=experiment_setup.MEASUREMENT_BACKENDS, default=experiment_setup.ENERGIBRIDGE_BACKEND,
+                     help="measure with EnergiBridge or by sampling the RAPL counters in-process (Linux)")
+    run.add_argument("--sample-interval", type=float, default=DEFAULT_RAPL_INTERVAL * 1000,
+                     help="milliseconds between RAPL samples with --backend rapl (default: %(default)s)")
+    run.add_argument("--rapl-root", default=RAPL_ROOT, help="powercap sysfs directory with the RAPL zones")
+    run.add_argument("--tasks", required=True, nargs="+", help="Gradle tasks to measure")
+    run.add_argument("--iterations", type=int, default=30, help="iterations, or the maximum with --adaptive-iterations")
+    run.add_argument("--adaptive-iterations", action="store_true",
+                     help="stop running a task once the confidence interval of its mean energy is narrow enough")
+    run.add_argument("--min-iterations", type=int, default=DEFAULT_MIN_ITERATIONS)
+    run.add_argument("--ci-width", type=float, default=DEFAULT_CI_WIDTH,
+                     help="target confidence interval width relative to the mean (default: %(default)s)")
+    run.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    run.add_argument("--name", default="experiment", help="experiment name")
+    run.add_argument("--timeout-tasks", type=float, default=60, help="seconds between tasks")
+    run.add_argument("--timeout-repetitions", type=float, default=300, help="seconds between iterations")
+    run.add_argument("--warmup", action="store_true", help="perform a hardware warmup first")
+    run.add_argument("--warmup-cores", type=int, default=None, help="cores to load during warmup (default: all)")
+    run.add_argument("--single-build", action="store_true", help="run all tasks in one Gradle build per iteration")
+    run.add_argument("--adaptive-cooldown", action="store_true",
+                     help="continue as soon as power is back at the idle baseline; the timeouts become maximum waits")
+    run.add_argument("--cooldown-tolerance", type=float, default=DEFAULT_TOLERANCE,
+                     help="allowed power above the idle baseline, as a fraction (default: %(default)s)")
+    run.add_argument("--idle-max-age", type=float, default=DEFAULT_MAX_AGE,
+                     help="reuse this host's idle baseline if younger than this many seconds, 0 to always measure")
+    run.add_argument("--idle-interval", type=float, default=DEFAULT_SAMPLE_INTERVAL,
+                     help="seconds between idle samples during the experiment, 0 to disable")
+    run.add_argument("--log", default=None, help="also append the progress events to this JSON-lines file")
+    run.set_defaults(func=run_command)
+
+    resume = subparsers.add_parser("resume", help="continue an interrupted experiment")
+    resume.add_argument("experiment_dir")
+    resume.add_argument("--log", default=None, help="also append the progress events to this JSON-lines file")
+    resume.set_defaults(func=resume_command)
+
+    tasks = subparsers.add_parser("tasks", help="list the tasks a Gradle command would run")
+    tasks.add_argument("--repo", required=True, help="directory of the Gradle project")
+    tasks.add_argument("--command", default="build", help="Gradle command to inspect")
+    tasks.add_argument("--refresh", action="store_true", help="ignore previously discovered tasks")
+    tasks.set_defaults(func=tasks_command)
+
+    summarize = subparsers.add_parser("summarize", help="summarize an experiment directory into the results store")
+    summarize.add_argument("experiment_dir")
+    summarize.add_argument("--workers", type=int, default=None, help="parallel workers (default: CPU count)")
+    summarize.set_defaults(func=summarize_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        emit({"event": "interrupted"})
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        emit({"event": "error", "message": str(e)})
+        return EXIT_TASK_FAILED
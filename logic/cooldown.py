@@ -0,0 +1,77 @@
+# logic/cooldown.py
+
+import glob
+import os
+import time
+
+DEFAULT_TOLERANCE = 0.10  # power may be 10% above the idle baseline
+SAMPLE_SECONDS = 5
+MIN_SAMPLE_SECONDS = 1
+RAPL_ROOT = "/sys/class/powercap"
+
+
+def wait_until_idle(baseline_power, measure_power, max_wait, tolerance=DEFAULT_TOLERANCE, sample_seconds=SAMPLE_SECONDS):
+    """
+    Measure the power in windows of sample_seconds until it is within tolerance of
+    baseline_power, but wait no longer than max_wait seconds.
+    measure_power(seconds) blocks for that long and returns the mean power in W, or None.
+    Returns (seconds waited, last measured power, whether the baseline was reached).
+    """
+    start = time.monotonic()
+    power = None
+    while True:
+        remaining = max_wait - (time.monotonic() - start)
+        if remaining < MIN_SAMPLE_SECONDS:
+            time.sleep(max(remaining, 0))
+            return time.monotonic() - start, power, False
+
+        power = measure_power(min(sample_seconds, remaining))
+        if power is None:
+            # Power can't be measured here: fall back to the fixed pause
+            time.sleep(max(max_wait - (time.monotonic() - start), 0))
+            return time.monotonic() - start, None, False
+        if power <= baseline_power * (1 + tolerance):
+            return time.monotonic() - start, power, True
+
+
+def rapl_package_zones(root=RAPL_ROOT):
+    """
+    The readable RAPL package zones (intel-rapl:N), or an empty list.
+    """
+    zones = []
+    for zone in sorted(glob.glob(os.path.join(root, "intel-rapl:*"))):
+        if os.path.basename(zone).count(":") != 1:
+            continue  # sub-zones (core, uncore, dram) are included in the package
+        try:
+            with open(os.path.join(zone, "energy_uj")) as f:
+                int(f.read())
+            zones.append(zone)
+        except (OSError, ValueError):
+            pass
+    return zones
+
+
+def read_zone(zone, name):
+    with open(os.path.join(zone, name)) as f:
+        return int(f.read())
+
+
+def rapl_power(seconds, zones):
+    """
+    Mean package power in W over the next `seconds`, read from the RAPL energy counters.
+    """
+    try:
+        before = [read_zone(zone, "energy_uj") for zone in zones]
+        start = time.monotonic()
+        time.sleep(seconds)
+        after = [read_zone(zone, "energy_uj") for zone in zones]
+        elapsed = time.monotonic() - start
+        energy_uj = 0
+        for zone, first, last in zip(zones, before, after):
+            if last < first:
+                # Counter wrapped around
+                last += read_zone(zone, "max_energy_range_uj")
+            energy_uj += last - first
+        return energy_uj / 1e6 / elapsed
+    except (OSError, ValueError):
+        return None
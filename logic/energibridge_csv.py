@@ -0,0 +1,153 @@
+# logic/energibridge_csv.py
+
+import csv
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from logic.rapl_sampler import counter_ranges_path
+
+CPU_ENERGY_COLUMNS = ("PACKAGE_ENERGY (J)", "CPU_ENERGY (J)")
+CPU_POWER_COLUMNS = ("SYSTEM_POWER (Watts)", "CPU_POWER (Watts)")
+RAM_ENERGY_COLUMN = "DRAM_ENERGY (J)"
+USED_MEMORY_COLUMN = "USED_MEMORY"
+
+# Cumulative counters keep float64 precision, per-sample readings fit in float32
+COLUMN_DTYPES = {
+    "Time": "int64",
+    "Delta": "float32",
+    "PACKAGE_ENERGY (J)": "float64",
+    "CPU_ENERGY (J)": "float64",
+    "DRAM_ENERGY (J)": "float64",
+    "SYSTEM_POWER (Watts)": "float32",
+    "CPU_POWER (Watts)": "float32",
+}
+
+
+def read_header(csv_path):
+    """
+    Read only the header line of an EnergiBridge CSV.
+    """
+    with open(csv_path, newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def detect_schema(columns):
+    """
+    Find which energy/power columns the EnergiBridge build on this platform emitted.
+    """
+    return {
+        "cpu_energy": next((c for c in CPU_ENERGY_COLUMNS if c in columns), None),
+        "cpu_power": next((c for c in CPU_POWER_COLUMNS if c in columns), None),
+        "ram_energy": RAM_ENERGY_COLUMN if RAM_ENERGY_COLUMN in columns else None,
+        "used_memory": USED_MEMORY_COLUMN in columns,
+    }
+
+
+def read_energy_trace(csv_path):
+    """
+    Load only the columns needed for energy computations, with compact dtypes.
+    Returns the DataFrame together with the detected schema.
+    """
+    schema = detect_schema(read_header(csv_path))
+    usecols = energy_columns(schema)
+    df = pd.read_csv(csv_path, usecols=usecols, dtype={c: COLUMN_DTYPES[c] for c in usecols})
+    return df, schema
+
+
+def energy_columns(schema):
+    """
+    The columns energy computations need for a trace with the given schema.
+    """
+    if schema["cpu_energy"] is None and schema["cpu_power"] is None:
+        raise NotImplementedError("No CPU energy or power column found")
+
+    # A direct energy counter takes precedence over power, as in compute_cpu_energy_from_csv
+    cpu_col = schema["cpu_energy"] or schema["cpu_power"]
+    usecols = ["Time", "Delta", cpu_col]
+    if schema["ram_energy"]:
+        usecols.append(schema["ram_energy"])
+    return usecols
+
+
+def read_counter_ranges(csv_path):
+    """
+    The zone ranges (J) record_counter_ranges stored for csv_path, per energy column as
+    counter_intervals takes them, or {} if none were recorded.
+    """
+    try:
+        with open(counter_ranges_path(csv_path), encoding="utf-8") as f:
+            zone_ranges = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    ranges = {column: zone_ranges["package"] for column in CPU_ENERGY_COLUMNS if zone_ranges.get("package")}
+    if zone_ranges.get("dram"):
+        ranges[RAM_ENERGY_COLUMN] = zone_ranges["dram"]
+    return ranges
+
+
+def wrapped_interval(drop, max_range=None):
+    """
+    Energy (J) of an interval in which a cumulative counter went down by drop (J).
+    max_range is the range of the counter or, for a column summing several zones, the list of
+    the zones' ranges. Only a drop of more than half a range is a wraparound: the range of the
+    zone that wrapped is added back. Smaller drops (a reset or jitter) and drops of counters
+    with an unknown range count as no energy.
+    """
+    if max_range is None:
+        return 0.0
+    ranges = sorted(np.atleast_1d(np.asarray(max_range, dtype="float64")))
+    if drop <= ranges[0] / 2:
+        return 0.0
+    wrapped = next((r for r in ranges if r >= drop), None)
+    if wrapped is None:
+        # Several zones wrapped within one interval
+        wrapped = math.ceil(drop / ranges[-1]) * ranges[-1]
+    return float(wrapped - drop)
+
+
+def counter_intervals(values, max_range=None):
+    """
+    Energy (J) between consecutive readings of a cumulative energy counter. Intervals in which
+    the counter went down are corrected with wrapped_interval.
+    """
+    values = np.asarray(values, dtype="float64")
+    intervals = np.diff(values)
+    for i in np.flatnonzero(intervals < 0):
+        intervals[i] = wrapped_interval(-intervals[i], max_range)
+    return intervals
+
+
+def integrate_counter(values, max_range=None):
+    """
+    Per-interval energies and total energy (J) of a cumulative energy counter, corrected for wraparound.
+    """
+    intervals = counter_intervals(values, max_range)
+    return intervals, float(intervals.sum())
+
+
+def compute_energies(df, schema, counter_ranges=None):
+    """
+    Compute CPU energy (J), RAM energy (J) and run time (s) of a loaded trace.
+    RAM energy is -1 on platforms without a DRAM metric (Mac) and None if it can't be determined.
+    counter_ranges maps energy columns to their counter ranges, as read_counter_ranges returns them.
+    """
+    counter_ranges = counter_ranges or {}
+    if schema["cpu_energy"]:
+        col = schema["cpu_energy"]
+        _, cpu = integrate_counter(df[col].to_numpy(), counter_ranges.get(col))
+    else:
+        cpu = float((df[schema["cpu_power"]].astype("float64") * (df["Delta"].astype("float64") / 1_000)).sum())
+
+    if schema["ram_energy"]:
+        col = schema["ram_energy"]
+        _, ram = integrate_counter(df[col].to_numpy(), counter_ranges.get(col))
+    elif schema["used_memory"]:
+        ram = -1  # Mac does not have ram energy metric
+    else:
+        ram = None
+
+    run_time = (df["Time"].iloc[-1] - df["Time"].iloc[0]) / 1_000
+    return cpu, ram, float(run_time)
@@ -0,0 +1,88 @@
+# logic/energy_cache.py
+
+import os
+import json
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = os.path.join("results", "energy_cache.sqlite")
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def file_fingerprint(paths):
+    """
+    Identify the current content of a set of files by their size and modification time.
+    """
+    parts = []
+    for path in paths:
+        if not os.path.exists(path):
+            parts.append("-")
+            continue
+        stat = os.stat(path)
+        parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+class EnergyCache:
+    """
+    Persistent cache of per-run energy measurements, keyed by the absolute path of the run's
+    results.csv and invalidated when the fingerprint of its source files changes.
+    Least recently used entries are evicted once the cache holds more than max_entries runs.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "path TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, tasks TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS runs_last_used ON runs (last_used)")
+        self.connection.commit()
+
+    def get_many(self, keys):
+        """
+        Look up several (path, fingerprint) keys. Returns the cached task measurements,
+        or None for runs that are missing or whose files changed.
+        """
+        results = []
+        hits = []
+        for path, fingerprint in keys:
+            row = self.connection.execute(
+                "SELECT fingerprint, tasks FROM runs WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+            if row is not None and row[0] == fingerprint:
+                results.append(json.loads(row[1]))
+                hits.append(os.path.abspath(path))
+            else:
+                results.append(None)
+
+        now = time.time()
+        self.connection.executemany("UPDATE runs SET last_used = ? WHERE path = ?", [(now, p) for p in hits])
+        self.connection.commit()
+        return results
+
+    def put_many(self, entries):
+        """
+        Store (path, fingerprint, tasks) entries, then evict the least recently used runs.
+        """
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO runs (path, fingerprint, tasks, last_used) VALUES (?, ?, ?, ?)",
+            [(os.path.abspath(path), fingerprint, json.dumps(tasks), now) for path, fingerprint, tasks in entries]
+        )
+        self.evict()
+        self.connection.commit()
+
+    def evict(self):
+        excess = self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM runs WHERE path IN (SELECT path FROM runs ORDER BY last_used LIMIT ?)", (excess,)
+            )
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,212 @@
+# logic/events.py
+
+"""
+Typed progress events of an experiment and the sinks that consume them.
+run_experiment sends every event to one sink; the GUI, the CLI and the
+events.jsonl log of each experiment are all sinks.
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+EVENT_LOG_FILE = "events.jsonl"
+
+
+@dataclass
+class Event:
+    time: float = field(default_factory=time.time, init=False)
+
+    name = "event"
+
+    def to_dict(self):
+        return {"event": self.name, **asdict(self)}
+
+
+@dataclass
+class ExperimentStarted(Event):
+    experiment: str
+    directory: str
+    tasks: list
+    iterations: int
+    resumed_runs: int = 0  # runs already finished before a resume
+    name = "experiment_started"
+
+
+@dataclass
+class IdleMeasured(Event):
+    duration: float
+    cpu_energy: float = None
+    source: str = "measured"  # or "cached" when a recent baseline was reused
+    name = "idle_measured"
+
+
+@dataclass
+class WarmupProgress(Event):
+    elapsed: float
+    remaining: float
+    power: float = None
+    temperature: float = None
+    name = "warmup_progress"
+
+
+@dataclass
+class WarmupFinished(Event):
+    duration: float
+    cores: int = None
+    plateaued: bool = False
+    power: float = None
+    temperature: float = None
+    name = "warmup_finished"
+
+
+@dataclass
+class TaskStarted(Event):
+    task: str
+    iteration: int
+    name = "task_started"
+
+
+@dataclass
+class RunProgress(Event):
+    task: str
+    iteration: int
+    elapsed: float
+    power: float = None  # mean CPU power since the previous progress event
+    cpu_energy: float = None
+    ram_energy: float = None
+    name = "run_progress"
+
+
+@dataclass
+class TaskFinished(Event):
+    task: str
+    iteration: int
+    returncode: int
+    duration: float
+    cpu_energy: float = None
+    ram_energy: float = None
+    name = "task_finished"
+
+
+@dataclass
+class TaskConverged(Event):
+    task: str
+    runs: int
+    mean_energy: float
+    ci_width: float
+    name = "task_converged"
+
+
+@dataclass
+class CooldownFinished(Event):
+    after: str
+    waited: float
+    power: float
+    baseline: float
+    reached_idle: bool
+    name = "cooldown_finished"
+
+
+@dataclass
+class IterationFinished(Event):
+    iteration: int
+    iterations: int
+    duration: float
+    eta: float
+    name = "iteration_finished"
+
+
+@dataclass
+class ExperimentFinished(Event):
+    directory: str
+    duration: float
+    name = "experiment_finished"
+
+
+@dataclass
+class ExperimentError(Event):
+    message: str
+    task: str = None
+    iteration: int = None
+    name = "error"
+
+
+class EventSink:
+    """
+    Receives the events of an experiment. Subclasses override emit.
+    """
+
+    def emit(self, event):
+        pass
+
+    def close(self):
+        pass
+
+
+class CallbackSink(EventSink):
+    def __init__(self, callback):
+        self.callback = callback
+
+    def emit(self, event):
+        self.callback(event)
+
+
+class QueueSink(EventSink):
+    """
+    Puts events on a queue, e.g. for a GUI polling from its main thread.
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    def emit(self, event):
+        self.queue.put(event)
+
+
+class JsonLinesSink(EventSink):
+    """
+    Writes one JSON object per event to a file path or an open text stream.
+    """
+
+    def __init__(self, target):
+        self.owns_stream = isinstance(target, str)
+        self.stream = open(target, "a", encoding="utf-8") if self.owns_stream else target
+        self.lock = threading.Lock()
+
+    def emit(self, event):
+        with self.lock:
+            self.stream.write(json.dumps(event.to_dict(), default=str) + "\n")
+            self.stream.flush()
+
+    def close(self):
+        if self.owns_stream:
+            self.stream.close()
+
+
+class MultiSink(EventSink):
+    """
+    Forwards events to several sinks. A failing sink does not stop the others or the experiment.
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = [sink for sink in sinks if sink is not None]
+
+    def emit(self, event):
+        for sink in self.sinks:
+            try:
+                sink.emit(event)
+            except Exception as e:
+                print(f"Event sink {type(sink).__name__} failed: {e}")
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
@@ -1,14 +1,43 @@
 import subprocess
 import re
 import os
+import shlex
 import time
 import datetime
 import random
+import shutil
+import signal
 import stat
-
-from logic.experiment_summary import extract_and_append_summary
+import threading
+from statistics import fmean
+
+from logic.cooldown import DEFAULT_TOLERANCE, RAPL_ROOT, rapl_package_zones, rapl_power, wait_until_idle
+from logic.events import (
+    EVENT_LOG_FILE, CooldownFinished, ExperimentError, ExperimentFinished, ExperimentStarted, IdleMeasured, IterationFinished,
+    JsonLinesSink, MultiSink, RunProgress, TaskConverged, TaskFinished, TaskStarted, WarmupFinished, WarmupProgress, format_duration,
+)
+from logic.idle_baseline import (
+    DEFAULT_MAX_AGE, DEFAULT_SAMPLE_INTERVAL, IDLE_SAMPLES_DIR, IdleBaselineStore, append_idle_sample, host_id,
+    read_idle_samples,
+)
+from logic.journal import ExperimentJournal, JournalState, read_journal
+from logic.rapl_sampler import (
+    DEFAULT_SAMPLE_INTERVAL as DEFAULT_RAPL_INTERVAL, rapl_available, record_counter_ranges, run_sampled, sample_idle,
+)
+from logic.stopping import DEFAULT_CI_WIDTH, DEFAULT_CONFIDENCE, DEFAULT_MIN_ITERATIONS, has_converged, relative_ci_width
+from logic.task_cache import get_cached_tasks
+from logic.warmup import DEFAULT_MAX_DURATION, DEFAULT_MIN_DURATION, run_warmup
+from logic.task_timeline import FULL_BUILD_DIR, write_timeline_init_script
 
 repository: str
+energibridge_path = None
+
+ENERGIBRIDGE_BACKEND = "energibridge"
+RAPL_BACKEND = "rapl"
+MEASUREMENT_BACKENDS = (ENERGIBRIDGE_BACKEND, RAPL_BACKEND)
+measurement_backend = ENERGIBRIDGE_BACKEND
+sample_interval = DEFAULT_RAPL_INTERVAL
+rapl_root = RAPL_ROOT
 
 def set_gradle_repository_path(path):
     """
@@ -27,6 +56,19 @@ def set_energibridge_path(path):
     energibridge_path = path
     return energibridge_path
 
+def set_measurement_backend(backend, interval=DEFAULT_RAPL_INTERVAL, root=RAPL_ROOT):
+    """
+    Measure with EnergiBridge, or with the in-process RAPL sampler (Linux) reading the counters
+    under root every interval seconds. Returns the backend, or None if it can't be used here.
+    """
+    global measurement_backend, sample_interval, rapl_root
+    if backend not in MEASUREMENT_BACKENDS:
+        return None
+    if backend == RAPL_BACKEND and not rapl_available(root):
+        return None
+    measurement_backend, sample_interval, rapl_root = backend, interval, root
+    return measurement_backend
+
 
 def build_gradle_and_clean_commands(energibridge_path, output_dir, task: str):
     output_file = os.path.join(output_dir, "results.csv")
@@ -64,90 +106,241 @@ def build_gradle_and_clean_commands(energibridge_path, output_dir, task: str):
 #     return full_command #, clean_command
 #
 
-def warmup_hardware(duration=300):
+def warmup_hardware(duration=DEFAULT_MAX_DURATION, sink=None, cores=None, min_duration=DEFAULT_MIN_DURATION, measure=None):
     """
-    Warm up the hardware by calculating Fibonacci numbers for 5 minutes.
-    This creates a CPU load that stabilizes the system before experiments.
+    Warm up the hardware by calculating Fibonacci numbers on `cores` cores (all by default)
+    until package power and temperature plateau, for at least min_duration and at most
+    duration seconds. measure(seconds), if given, samples the power.
+    Progress is sent to sink, if given. Returns how long the warmup took.
     """
-    print(f"Starting hardware warmup using Fibonacci sequence for {duration} seconds...")
-    
-    def fibonacci(n):
-        if n <= 1:
-            return n
-        return fibonacci(n-1) + fibonacci(n-2)
-    
-    start_time = time.time()
-    end_time = start_time + duration
-    iterations = 0
-    last_report_time = start_time
-    
-    while time.time() < end_time:
-        # Calculate a Fibonacci number (using small values to avoid excessive computation)
-        n = iterations % 30  # Keep n reasonably small to avoid long calculations
-        fib_result = fibonacci(n)
-        iterations += 1
-        
-        # Report progress every 10 seconds
-        current_time = time.time()
-        if current_time - last_report_time >= 30:
-            elapsed = current_time - start_time
-            remaining = end_time - current_time
-            print(f"Warmup progress: {elapsed:.1f}s elapsed, {remaining:.1f}s remaining, {iterations} iterations completed")
-            last_report_time = current_time
-    
-    total_time = time.time() - start_time
-    print(f"Hardware warmup complete after {total_time:.2f} seconds with {iterations} Fibonacci calculations.\n")
-    time.sleep(60)
+    cores = cores or os.cpu_count() or 1
+    print(f"Starting hardware warmup on {cores} cores for {min(min_duration, duration)}-{duration} seconds...")
+
+    def on_progress(elapsed, power, temperature):
+        readings = ", ".join(
+            reading for reading in (
+                f"{power:.1f} W" if power is not None else None,
+                f"{temperature:.1f} °C" if temperature is not None else None,
+            ) if reading
+        )
+        print(f"Warmup progress: {elapsed:.1f}s elapsed" + (f", {readings}" if readings else ""))
+        if sink is not None:
+            sink.emit(WarmupProgress(elapsed, max(duration - elapsed, 0), power, temperature))
+
+    total_time, plateaued, power, temperature = run_warmup(measure, cores, min_duration, duration, on_progress=on_progress)
+    print(f"Hardware warmup complete after {total_time:.2f} seconds" + (" (readings plateaued).\n" if plateaued else ".\n"))
+    if sink is not None:
+        # The readings the warmup ended on, i.e. the plateau the measurements start from
+        sink.emit(WarmupFinished(total_time, cores, plateaued, power, temperature))
+    return total_time
 
 
-def idle_consumption(output_file):
+IDLE_SAMPLE_SECONDS = 15
+
+
+def idle_consumption(output_file, seconds=IDLE_SAMPLE_SECONDS):
     """
-    Measure the idle consumption of the system for 15 seconds.
+    Measure the idle consumption of the system for the given number of seconds.
     """
+    record_counter_ranges(output_file, rapl_root)
+    if measurement_backend == RAPL_BACKEND:
+        sample_idle(output_file, seconds, sample_interval, rapl_root)
+        print(f"Idle consumption measured for {seconds} seconds. Output saved to {output_file}.")
+        return None
+
     if os.name == 'nt':
-        idle_command = 'timeout /T 15'
+        idle_command = f'timeout /T {seconds}'
     else:
-        idle_command = 'sleep 15'
+        idle_command = f'sleep {seconds}'
 
     gradle_command = f'"{energibridge_path}" -o "{output_file}" --summary {idle_command}'
     result = subprocess.run(gradle_command, shell=True, capture_output=True, text=True, cwd=repository)
 
-    print(f"Idle consumption measured for 15 seconds. Output saved to {output_file}.")
+    print(f"Idle consumption measured for {seconds} seconds. Output saved to {output_file}.")
     return result
 
 
-def getTasks(cmd="build"):
-    command = f"gradle {cmd} --rerun-tasks --dry-run"
-    print("Running command to get tasks: ", command)
-    print("This may take a while...")
-    print("Please wait...\n")
+def measure_idle_sample(experiment_dir, output_file, sink, seconds=IDLE_SAMPLE_SECONDS):
+    """
+    Measure idle consumption into output_file, add it to the experiment's idle samples and
+    to this host's stored baselines. Returns the idle CPU energy, or None.
+    """
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    start = time.monotonic()
+    idle_energy_result = idle_consumption(output_file, seconds)
+    print("Idle consumption measurement completed.\n Results: \n", idle_energy_result)
+
+    # Deferred so the GUI can start without loading pandas
+    from logic.experiment_summary import compute_energy_from_csv
+    energy = compute_energy_from_csv(output_file)
+    if energy is None:
+        sink.emit(IdleMeasured(time.monotonic() - start, None))
+        return None
+    cpu, _, run_time = energy
+    measured_at = time.time() - run_time / 2
+    append_idle_sample(experiment_dir, measured_at, cpu, run_time, "measured")
+    store = IdleBaselineStore()
+    try:
+        store.record(host_id(), measured_at, cpu, run_time)
+    finally:
+        store.close()
+    sink.emit(IdleMeasured(time.monotonic() - start, cpu))
+    return cpu
+
+
+def take_idle_baseline(experiment_dir, max_age, sink):
+    """
+    Reuse this host's idle baseline if one was measured less than max_age seconds ago,
+    otherwise measure it.
+    """
+    store = IdleBaselineStore()
+    try:
+        cached = store.latest(host_id(), max_age) if max_age > 0 else None
+    finally:
+        store.close()
+    if cached is None:
+        measure_idle_sample(experiment_dir, os.path.join(experiment_dir, "idle_consumption.csv"), sink)
+        return
+
+    measured_at, cpu, duration = cached
+    print(f"Reusing the idle baseline measured {format_duration(time.time() - measured_at)} ago ({cpu / duration:.2f} W).")
+    append_idle_sample(experiment_dir, measured_at, cpu, duration, "cached")
+    sink.emit(IdleMeasured(0.0, cpu, "cached"))
+
+
+def mean_power(csv_path):
+    """
+    Mean CPU power in W of an EnergiBridge CSV, or None.
+    """
+    # Deferred so the GUI can start without loading pandas
+    from logic.experiment_summary import compute_energy_from_csv
+    energy = compute_energy_from_csv(csv_path)
+    if energy is None or energy[2] <= 0:
+        return None
+    cpu, _, run_time = energy
+    return cpu / run_time
+
+
+def power_meter(output_dir):
+    """
+    Return measure(seconds) giving the mean power over the next seconds: read directly
+    from RAPL where the counters are readable, otherwise measured with EnergiBridge.
+    """
+    zones = rapl_package_zones(rapl_root)
+    if zones:
+        return lambda seconds: rapl_power(seconds, zones)
+
+    sample_file = os.path.join(output_dir, "power_sample.csv")
+
+    def measure(seconds):
+        # EnergiBridge's sleep resolution is whole seconds
+        idle_consumption(sample_file, max(1, round(seconds)))
+        return mean_power(sample_file)
+    return measure
+
+
+def cool_down(max_wait, baseline_power, measure, tolerance, sink, after):
+    """
+    Wait until power is back near the idle baseline, for at most max_wait seconds.
+    Without a baseline this is a fixed pause of max_wait seconds.
+    """
+    if baseline_power is None:
+        print(f"Waiting {max_wait} seconds...\n")
+        time.sleep(max_wait)
+        return max_wait
+
+    print(f"Waiting up to {max_wait} seconds for power to return to idle ({baseline_power:.2f} W)...")
+    waited, power, reached = wait_until_idle(baseline_power, measure, max_wait, tolerance)
+    print(f"Cooldown after {after} took {waited:.1f} seconds" + (" (idle reached)\n" if reached else " (maximum wait)\n"))
+    sink.emit(CooldownFinished(after, waited, power, baseline_power, reached))
+    return waited
+
+
+def iter_tasks(cmd="build", cancel_event=None):
+    """
+    Yield the tasks `gradle <cmd>` would run as soon as Gradle reports them.
+    Gradle is stopped when cancel_event is set.
+    """
+    # No shell in between, so stopping the process stops Gradle itself
+    command = [shutil.which("gradle") or "gradle", *shlex.split(cmd, posix=os.name != 'nt'), "--rerun-tasks", "--dry-run"]
+    print("Running command to get tasks: ", " ".join(command))
     process = subprocess.Popen(
         command,
-        shell=True,
         cwd=repository,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True
+        text=True,
+        # Its own process group, so anything Gradle started is stopped with it
+        start_new_session=os.name != 'nt',
     )
+    if cancel_event is not None:
+        # Gradle can be silent for minutes while configuring, so don't wait for the next line
+        threading.Thread(target=_terminate_on_cancel, args=(process, cancel_event), daemon=True).start()
+
     regex = re.compile(r"^(\S+) SKIPPED")
-    tasks = []
-    output_lines = []
+    try:
+        for line in process.stdout:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            match = regex.match(line)
+            if match:
+                yield match.group(1)
+    finally:
+        if process.poll() is None:
+            _terminate(process)
+        process.wait()
+
+
+def _terminate(process):
+    """
+    Stop a process started by iter_tasks together with its children.
+    """
+    try:
+        if os.name == 'nt':
+            # gradle.bat runs Java under cmd.exe, which terminate() alone would leave running
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+    except OSError:
+        process.terminate()
 
-    for line in process.stdout:
-        print(line, end='')
-        output_lines.append(line)
 
-        match = regex.match(line)
-        if match:
-            task = match.group(1)
-            print(f"Found task: {task}")
-            tasks.append(task)
+def _terminate_on_cancel(process, cancel_event):
+    while process.poll() is None:
+        if cancel_event.wait(0.2):
+            _terminate(process)
+            return
 
-    process.wait()
 
+def getTasks(cmd="build"):
+    print("This may take a while...")
+    print("Please wait...\n")
+    tasks = list(iter_tasks(cmd))
+    print(f"Found {len(tasks)} tasks.")
     return tasks
 
 
+def get_tasks_cached(cmd="build", refresh=False, on_task=None, cancel_event=None):
+    """
+    Like getTasks, but reuses the tasks discovered earlier for the same project directory and command
+    as long as the settings/build scripts and gradle.properties files are unchanged.
+    If Gradle has to run, on_task is called with each task as it is discovered.
+    A cancelled discovery returns no tasks and is not cached.
+    """
+    def discover(cmd):
+        tasks = []
+        for task in iter_tasks(cmd, cancel_event):
+            tasks.append(task)
+            if on_task is not None:
+                on_task(task)
+        if cancel_event is not None and cancel_event.is_set():
+            return []
+        return tasks
+
+    gradle_root = find_gradle_root() or repository
+    return get_cached_tasks(gradle_root, cmd, discover, refresh=refresh, project_dir=repository)
+
+
 def run_task(task, output_dir):
     """
     Runs a single task and saves results to the specified output directory.
@@ -155,14 +348,23 @@ def run_task(task, output_dir):
     print(f"Running task: {task}\n Output directory: {output_dir}")
 
     os.makedirs(output_dir, exist_ok=True)
+    record_counter_ranges(os.path.join(output_dir, "results.csv"), rapl_root)
     
-    gradle_command = build_gradle_and_clean_commands(energibridge_path, output_dir, task)
+    if measurement_backend == RAPL_BACKEND:
+        gradle_command = f'./gradlew {task}'
+    else:
+        gradle_command = build_gradle_and_clean_commands(energibridge_path, output_dir, task)
 
     try:
         gradle_root = find_gradle_root()
         if gradle_root is None:
             gradle_root = repository
-        result = subprocess.run(gradle_command, shell=True, capture_output=True, text=True, cwd=gradle_root)
+        if measurement_backend == RAPL_BACKEND:
+            # No EnergiBridge or shell in between, the counters are sampled in-process
+            result = run_sampled(["./gradlew", *shlex.split(task)], os.path.join(output_dir, "results.csv"),
+                                 gradle_root, sample_interval, rapl_root)
+        else:
+            result = subprocess.run(gradle_command, shell=True, capture_output=True, text=True, cwd=gradle_root)
 
         # Save the command output to a log file
         with open(os.path.join(output_dir, "command_output.log"), "w") as f:
@@ -179,10 +381,118 @@ def run_task(task, output_dir):
         return None
 
 
-def run_experiment(experiment_name, iterations, timeout_between_repetitions, timeout_between_tasks, warmup, tasks, message_queue):
+def run_full_build(tasks, output_dir):
+    """
+    Runs all tasks in a single Gradle build and records per-task start/end timestamps
+    next to the EnergiBridge results, so the energy can be attributed to each task afterwards.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    init_script = write_timeline_init_script(output_dir)
+    return run_task(f'--init-script "{init_script}" {" ".join(tasks)}', output_dir)
+
+
+def run_streamed(sink, task, iteration, output_dir, run):
+    """
+    Call run() while its results.csv is ingested live, reporting the running power and energy
+    to the sink. Once it returns, the run is published to the energy cache and results store.
+    Returns (result, (CPU energy, RAM energy, run time) or None).
+    """
+    # Deferred so the GUI can start without loading pandas
+    from logic.experiment_summary import ingest_run
+    from logic.live_ingest import LiveIngester
+
+    csv_path = os.path.join(output_dir, "results.csv")
+    if os.path.exists(csv_path):
+        os.remove(csv_path)  # left behind by an interrupted run of this unit
+
+    def on_progress(elapsed, power, cpu, ram):
+        sink.emit(RunProgress(task, iteration, elapsed, power, cpu, ram))
+
+    ingester = LiveIngester(csv_path, on_progress).start()
+    energies = None
+    try:
+        result = run()
+    finally:
+        try:
+            energies = ingester.stop()
+        except Exception as e:
+            print(f"Failed to ingest {csv_path}: {e}")
+
+    if result and os.path.exists(csv_path):
+        try:
+            ingest_run(output_dir, energies, ingester.end_time())
+        except Exception as e:
+            print(f"Failed to store the results of {output_dir}: {e}")
+    return result, energies
+
+
+def run_measured(sink, journal, task, iteration, output_dir, run):
+    """
+    Run one task (or full build) through run(), journal it and report it to the sink.
+    Returns the measured CPU + RAM energy, or None if the run failed or wasn't measured.
+    """
+    journal.unit_started(task, iteration)
+    sink.emit(TaskStarted(task, iteration))
+    start = time.monotonic()
+    result, energies = run_streamed(sink, task, iteration, output_dir, run)
+    duration = time.monotonic() - start
+    returncode = result.returncode if result else None
+    cpu, ram = energies[:2] if result and energies else (None, None)
+    energy = None
+    if returncode == 0 and cpu is not None:
+        energy = cpu + (ram if ram is not None and ram > 0 else 0)
+    journal.unit_finished(task, iteration, returncode, energy)
+    sink.emit(TaskFinished(task, iteration, returncode, duration, cpu, ram))
+    if returncode != 0:
+        sink.emit(ExperimentError(f"Task {task} failed with return code {returncode}", task, iteration))
+    return energy
+
+
+def run_experiment(experiment_name, iterations, timeout_between_repetitions, timeout_between_tasks, warmup, tasks, message_queue, single_build=False, sink=None,
+                   adaptive_cooldown=False, cooldown_tolerance=DEFAULT_TOLERANCE, warmup_cores=None,
+                   adaptive_iterations=False, min_iterations=DEFAULT_MIN_ITERATIONS, ci_width=DEFAULT_CI_WIDTH,
+                   confidence=DEFAULT_CONFIDENCE, idle_max_age=DEFAULT_MAX_AGE, idle_sample_interval=DEFAULT_SAMPLE_INTERVAL):
     """
     Run an experiment with the given configuration.
+    If single_build is set, all tasks are executed in one Gradle build per iteration
+    and their energy is split across the recorded task intervals.
+    If adaptive_cooldown is set, the timeouts are maximum waits: the next task starts as soon as
+    power is within cooldown_tolerance (a fraction) of the idle baseline.
+    The warmup loads warmup_cores cores, all by default.
+    If adaptive_iterations is set, iterations is a maximum: a task is no longer run once it ran
+    min_iterations times and the confidence interval of its mean energy is narrower than ci_width
+    (relative to the mean).
+    The idle baseline of this host is reused if it is younger than idle_max_age seconds, and
+    re-sampled every idle_sample_interval seconds during the experiment (0 disables either).
+    Runs are measured with the backend chosen by set_measurement_backend, EnergiBridge by default.
+    Progress events (logic.events) go to sink, if given, and to events.jsonl in the experiment directory.
+    The configuration and progress are journaled, so an interrupted experiment can be continued
+    with resume_experiment.
     """
+    config = {
+        "experiment_name": experiment_name,
+        "iterations": iterations,
+        "timeout_between_repetitions": timeout_between_repetitions,
+        "timeout_between_tasks": timeout_between_tasks,
+        "warmup": warmup,
+        "tasks": list(tasks),
+        "single_build": single_build,
+        "adaptive_cooldown": adaptive_cooldown,
+        "cooldown_tolerance": cooldown_tolerance,
+        "warmup_cores": warmup_cores,
+        "adaptive_iterations": adaptive_iterations,
+        "min_iterations": min_iterations,
+        "ci_width": ci_width,
+        "confidence": confidence,
+        "idle_max_age": idle_max_age,
+        "idle_sample_interval": idle_sample_interval,
+        "repository": repository,
+        "energibridge_path": energibridge_path,
+        "measurement_backend": measurement_backend,
+        "sample_interval": sample_interval,
+        "rapl_root": rapl_root,
+    }
+
     # Create a timestamp for the experiment
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -192,54 +502,191 @@ def run_experiment(experiment_name, iterations, timeout_between_repetitions, tim
     os.makedirs(base_dir, exist_ok=True)  # Create base directory if it doesn't exist
     os.makedirs(experiment_dir, exist_ok=True)
 
+    journal = ExperimentJournal(experiment_dir)
+    journal.write_config(config)
+    return execute_experiment(experiment_dir, config, journal, JournalState(), message_queue, sink)
+
+
+def resume_experiment(experiment_dir, message_queue, sink=None):
+    """
+    Continue an interrupted experiment from its journal: finished (task, iteration) units
+    are skipped, the idle measurement is reused and the warmup is repeated.
+    """
+    def fail(message):
+        # Raised before execute_experiment reports errors, so tell the sink here
+        if sink is not None:
+            sink.emit(ExperimentError(message))
+        raise ValueError(message)
+
+    state = read_journal(experiment_dir)
+    if state.config is None:
+        fail(f"No experiment journal found in {experiment_dir}")
+    if state.completed:
+        print(f"Experiment in {experiment_dir} is already completed.")
+        message_queue.put("Experiment completed.")
+        return experiment_dir
+
+    set_gradle_repository_path(state.config["repository"])
+    backend = state.config.get("measurement_backend", ENERGIBRIDGE_BACKEND)
+    if set_measurement_backend(backend, state.config.get("sample_interval", DEFAULT_RAPL_INTERVAL),
+                               state.config.get("rapl_root", RAPL_ROOT)) is None:
+        fail(f"Measurement backend {backend} is not available on this machine")
+    if backend == ENERGIBRIDGE_BACKEND and set_energibridge_path(state.config["energibridge_path"]) is None:
+        fail(f"EnergiBridge executable not found: {state.config['energibridge_path']}")
+
+    print(f"Resuming experiment in {experiment_dir}: {len(state.finished)} runs already finished"
+          + (f", {len(state.failed)} failed runs to retry." if state.failed else "."))
+    journal = ExperimentJournal(experiment_dir)
+    return execute_experiment(experiment_dir, state.config, journal, state, message_queue, sink)
+
+
+def execute_experiment(experiment_dir, config, journal, state, message_queue, sink):
+    experiment_start = time.monotonic()
+    sink = MultiSink(sink, JsonLinesSink(os.path.join(experiment_dir, EVENT_LOG_FILE)))
+    try:
+        run_iterations(experiment_dir, config, journal, state, sink)
+
+        message_queue.put("Experiment completed.")
+
+        # Deferred so the GUI can start without loading pandas
+        from logic.experiment_summary import extract_and_append_summary
+        extract_and_append_summary(experiment_dir)
+        journal.write("completed")
+        sink.emit(ExperimentFinished(experiment_dir, time.monotonic() - experiment_start))
+    except Exception as e:
+        sink.emit(ExperimentError(str(e)))
+        raise
+    finally:
+        sink.close()
+        journal.close()
+
+    return experiment_dir
+
+
+def run_iterations(experiment_dir, config, journal, state, sink):
+    """
+    Measure idle consumption, warm up and run all iterations of an experiment,
+    skipping the units the journal state lists as finished.
+    """
+    experiment_name = config["experiment_name"]
+    iterations = config["iterations"]
+    tasks = config["tasks"]
+    single_build = config["single_build"]
+    warmup_cores = config["warmup_cores"]
+    adaptive_iterations = config["adaptive_iterations"]
+
     print(f"=== Starting Experiment: {experiment_name} ===\n")
     print(f"Results will be saved in: {experiment_dir}\n")
+    sink.emit(ExperimentStarted(experiment_name, experiment_dir, list(tasks), iterations, len(state.finished)))
 
-    idle_energy_result = idle_consumption(os.path.join(experiment_dir, "idle_consumption.csv"))
-    print("Idle consumption measurement completed.\n Results: \n", idle_energy_result)
+    if not (state.idle_measured and read_idle_samples(experiment_dir)):
+        take_idle_baseline(experiment_dir, config.get("idle_max_age", DEFAULT_MAX_AGE), sink)
+        journal.write("idle_measured")
+    idle_samples = read_idle_samples(experiment_dir)
+    last_idle_sample = idle_samples[-1][0] if idle_samples else time.time()
+    idle_sample_interval = config.get("idle_sample_interval", DEFAULT_SAMPLE_INTERVAL)
+
+    baseline_power = None
+    if config["adaptive_cooldown"] and idle_samples and idle_samples[-1][2] > 0:
+        baseline_power = idle_samples[-1][1] / idle_samples[-1][2]
+    if config["adaptive_cooldown"] and baseline_power is None:
+        print("Idle power could not be measured, using fixed timeouts.")
+    measure = power_meter(experiment_dir)
+
+    def pause(max_wait, after):
+        return cool_down(max_wait, baseline_power, measure, config["cooldown_tolerance"], sink, after)
 
     clean_build_output()
     
     # Perform warmup if required
-    if warmup:
-        warmup_hardware()
+    if config["warmup"]:
+        warmup_hardware(sink=sink, cores=warmup_cores, measure=measure)
+
+    # Energy of every run, to stop measuring a task once its mean is known precisely enough
+    energies = {task: [] for task in ([FULL_BUILD_DIR] if single_build else tasks)}
+    converged = set()
+
+    def record(task, energy):
+        if not adaptive_iterations or energy is None:
+            return
+        energies[task].append(energy)
+        if has_converged(energies[task], config["min_iterations"], config["ci_width"], config["confidence"]):
+            converged.add(task)
+            width = relative_ci_width(energies[task], config["confidence"])
+            print(f"{task} converged after {len(energies[task])} runs (CI width {width:.1%} of the mean).")
+            sink.emit(TaskConverged(task, len(energies[task]), fmean(energies[task]), width))
+
+    def finished(task, iteration):
+        # Already measured before the experiment was resumed
+        if (task, iteration) not in state.finished:
+            return False
+        record(task, state.finished[(task, iteration)])
+        return True
 
     # Run experiments for each task
+    iterations_start = time.monotonic()
+    iterations_run = 0
     for i in range(iterations):
         iteration_number = i + 1
-
-        for task in tasks:
-            # Create a directory for the current iteration
-            task_dir_name = task.replace(':', '_')
-            task_dir = os.path.join(experiment_dir, task_dir_name)
-            os.makedirs(task_dir, exist_ok=True)
-            iteration_dir = os.path.join(task_dir, f"{iteration_number}")
-            os.makedirs(iteration_dir, exist_ok=True)
-
-            print(f"Iteration {iteration_number}/{iterations} for task: {task}")
-
-            # Execute task
-            run_task(task, iteration_dir)
-
-            print(f"Waiting {timeout_between_tasks} seconds before moving to the next task...\n")
-            time.sleep(timeout_between_tasks)
+        iteration_start = time.monotonic()
+        if adaptive_iterations and len(converged) == len(energies):
+            print(f"All tasks converged after {i} iterations.")
+            break
+
+        ran = False
+        if single_build:
+            if not finished(FULL_BUILD_DIR, iteration_number):
+                iteration_dir = os.path.join(experiment_dir, FULL_BUILD_DIR, f"{iteration_number}")
+                print(f"Iteration {iteration_number}/{iterations} for full build of {len(tasks)} tasks")
+                record(FULL_BUILD_DIR, run_measured(sink, journal, FULL_BUILD_DIR, iteration_number, iteration_dir,
+                                                    lambda: run_full_build(tasks, iteration_dir)))
+                ran = True
+        else:
+            for task in tasks:
+                if task in converged or finished(task, iteration_number):
+                    continue
+                # Create a directory for the current iteration
+                task_dir_name = task.replace(':', '_')
+                task_dir = os.path.join(experiment_dir, task_dir_name)
+                os.makedirs(task_dir, exist_ok=True)
+                iteration_dir = os.path.join(task_dir, f"{iteration_number}")
+                os.makedirs(iteration_dir, exist_ok=True)
+
+                print(f"Iteration {iteration_number}/{iterations} for task: {task}")
+
+                # Execute task
+                record(task, run_measured(sink, journal, task, iteration_number, iteration_dir, lambda: run_task(task, iteration_dir)))
+                ran = True
+
+                pause(config["timeout_between_tasks"], task)
+
+        if not ran:
+            continue
+        iterations_run += 1
 
         print(f"Completed all tasks for iteration {iteration_number}.")
         clean_build_output()
 
-        print(f"Waiting {timeout_between_repetitions} seconds for tail energy to settle...\n")
-        time.sleep(timeout_between_repetitions)
-        if timeout_between_repetitions > 120:
+        print("Waiting for tail energy to settle...")
+        waited = pause(config["timeout_between_repetitions"], f"iteration {iteration_number}")
+        # Track drift of the idle consumption during long experiments
+        if idle_sample_interval and time.time() - last_idle_sample >= idle_sample_interval:
+            sample_file = os.path.join(experiment_dir, IDLE_SAMPLES_DIR, f"{iteration_number}.csv")
+            if measure_idle_sample(experiment_dir, sample_file, sink) is not None:
+                last_idle_sample = time.time()
+                waited += IDLE_SAMPLE_SECONDS
+
+        if waited > 120:
             print("Hardware warmup after long pause.")
-            warmup_hardware(120)
+            warmup_hardware(120, sink=sink, cores=warmup_cores, measure=measure)
+
+        # Iterations take about equally long, including the pauses
+        average = (time.monotonic() - iterations_start) / iterations_run
+        sink.emit(IterationFinished(iteration_number, iterations, time.monotonic() - iteration_start,
+                                    average * (iterations - iteration_number)))
 
     print("=== Experiment completed. ===")
     print(f"All results saved in: {experiment_dir}")
-    message_queue.put("Experiment completed.")
-
-    extract_and_append_summary(experiment_dir)
-
-    return experiment_dir
 
 def clean_build_output():
     """
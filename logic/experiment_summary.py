@@ -1,25 +1,41 @@
 # logic/experiment_summary.py
 
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 
+from logic.energy_cache import DEFAULT_CACHE_PATH, EnergyCache, file_fingerprint
+from logic.binary_trace import ensure_trace, load_energy_trace
+from logic.energibridge_csv import compute_energies, read_counter_ranges
+from logic.rapl_sampler import counter_ranges_path
+from logic.idle_baseline import idle_energy_at, read_idle_samples
+from logic.results_store import DEFAULT_STORE_PATH, open_results_store
+from logic.task_attribution import attribute_csv_to_tasks
+from logic.task_timeline import FULL_BUILD_DIR, TASK_TIMELINE_FILE
 
-def compute_cpu_energy_from_csv(csv_path):
+# Below this many runs the summary is computed in-process
+PARALLEL_MIN_RUNS = 64
+
+
+def compute_energy_from_csv(csv_path):
+    """
+    Read an EnergiBridge CSV once (or its binary trace, if converted) and return
+    (CPU energy, RAM energy, run time).
+    """
     try:
-        df = pd.read_csv(csv_path, nrows=1)
-        columns = df.columns
-
-        if "PACKAGE_ENERGY (J)" in columns or "CPU_ENERGY (J)" in columns:
-            return compute_cpu_energy_direct(csv_path)
-            #return compute_cpu_energy_direct(csv_path)
-        elif "SYSTEM_POWER (Watts)" in columns or "CPU_POWER (Watts)" in columns:
-            return compute_cpu_energy_from_power(csv_path)
-            #return compute_cpu_energy_from_power(csv_path)
-        else:
-            raise NotImplementedError #should it be not implemented or metric not found?
+        df, schema = load_energy_trace(csv_path)
+        return compute_energies(df, schema, read_counter_ranges(csv_path))
     except Exception as e:
-        print(f"Failed to compute CPU energy from {csv_path}: {e}")
+        print(f"Failed to compute energy from {csv_path}: {e}")
+        return None
+
+def compute_cpu_energy_from_csv(csv_path):
+    energy = compute_energy_from_csv(csv_path)
+    if energy is None:
         return None
+    cpu, _, run_time = energy
+    return cpu, run_time
 
 # #def compute_cpu_energy_direct(csv_path):
 # def compute_cpu_energy_direct(csv_path):
@@ -40,34 +56,11 @@ def compute_cpu_energy_from_csv(csv_path):
 #     # return energy_consumed
 #     return df["Energy_Joules"].sum()
 
-def compute_cpu_energy_direct(csv_path):
-    df = pd.read_csv(csv_path)
-    col = "PACKAGE_ENERGY (J)" if "PACKAGE_ENERGY (J)" in df.columns else "CPU_ENERGY (J)"
-    raw_energy = df[col].iloc[-1] - df[col].iloc[0]
-    run_time = (df.iloc[-1]['Time'] - df.iloc[0]['Time']) / 1_000
-    return raw_energy, run_time
-
-def compute_cpu_energy_from_power(csv_path):
-    df = pd.read_csv(csv_path)
-    power_col = "SYSTEM_POWER (Watts)" if "SYSTEM_POWER (Watts)" in df.columns else "CPU_POWER (Watts)"
-    df["Delta_seconds"] = df["Delta"] / 1_000
-    df["Energy_Joules"] = df[power_col] * df["Delta_seconds"]
-    raw_energy = df["Energy_Joules"].sum()
-    run_time = (df.iloc[-1]['Time'] - df.iloc[0]['Time']) / 1_000
-    return raw_energy, run_time
-
 def compute_ram_energy_from_csv(csv_path):
-    try:
-        df = pd.read_csv(csv_path)
-        if "DRAM_ENERGY (J)" in df.columns:
-            return df["DRAM_ENERGY (J)"].iloc[-1] - df["DRAM_ENERGY (J)"].iloc[0]
-        elif "USED_MEMORY" in df.columns:
-            return -1 #Mac does not have ram energy metric
-        else:
-            raise NotImplementedError
-    except Exception as e:
-        print(f"Failed to compute RAM energy from {csv_path}: {e}")
+    energy = compute_energy_from_csv(csv_path)
+    if energy is None:
         return None
+    return energy[1]
 
 def compute_idle_energy_compensation(task_energy, task_run_time, total_idle_energy, idle_time):
     print(f"task_energy: {task_energy}, task_run_time: {task_run_time}, total_idle_energy: {total_idle_energy}, idle_time: {idle_time}")
@@ -83,55 +76,208 @@ def get_latest_experiment_folder(base_dir="experiment_results"):
     folders.sort(key=lambda name: name.split("_")[-1], reverse=True)
     return os.path.join(base_dir, folders[0]) if folders else None
 
-def extract_and_append_summary(latest_exp_path, summary_csv="results/all_experiments_summary.csv"):
+def list_run_folders(latest_exp_path):
+    """
+    List (task name, run folder, run path) for every run of an experiment.
+    The task name is None for single-build runs, whose tasks are read from the timeline.
+    """
+    runs = []
+    for task_folder in os.listdir(latest_exp_path):
+        task_path = os.path.join(latest_exp_path, task_folder)
+        if not os.path.isdir(task_path):
+            continue
+
+        for run_folder in os.listdir(task_path):
+            run_path = os.path.join(task_path, run_folder)
+            if run_folder.isdigit() and os.path.exists(os.path.join(run_path, "results.csv")):
+                runs.append(run_of_folder(run_path))
+    return runs
+
+def run_of_folder(run_path):
+    """
+    The (task name, run folder, run path) of the run stored in run_path.
+    """
+    task_folder = os.path.basename(os.path.dirname(run_path))
+    task_name = None if task_folder == FULL_BUILD_DIR else task_folder.replace("_", ":")
+    return task_name, os.path.basename(run_path), run_path
+
+def run_source_files(run):
+    """
+    Files a run's measurements are computed from.
+    """
+    task_name, _, run_path = run
+    csv_file = os.path.join(run_path, "results.csv")
+    files = [csv_file, counter_ranges_path(csv_file)]
+    if task_name is None:
+        files.append(os.path.join(run_path, TASK_TIMELINE_FILE))
+    return files
+
+def measure_run(run):
+    """
+    Energy and run time of every task of a single run, before idle compensation.
+    Safe to call from a worker process. Returns None if the run can't be read.
+    """
+    task_name, _, run_path = run
+    csv_file = os.path.join(run_path, "results.csv")
+    try:
+        # Later analyses of the run read the memory-mapped trace instead of the CSV,
+        # which is converted from the same parse the energy is computed from
+        if task_name is None:
+            return attribute_csv_to_tasks(csv_file, os.path.join(run_path, TASK_TIMELINE_FILE), convert=True)
+        #cpu = compute_cpu_energy_from_csv(csv_file)
+        df, schema = load_energy_trace(csv_file, convert=True)
+        cpu, ram, run_time = compute_energies(df, schema, read_counter_ranges(csv_file))
+        # The last sample, unlike the file's mtime, survives copying the experiment
+        end = float(df["Time"].iloc[-1]) / 1_000
+        return [{"Task": task_name, "CPU Energy": cpu, "RAM Energy": ram, "Run Time": run_time, "End": end}]
+    except Exception as e:
+        print(f"Error reading {csv_file}: {e}")
+        return None
+
+def measure_runs(runs, workers=None):
+    """
+    Measure all runs, fanning the parsing out to a process pool for large experiments.
+    workers defaults to the number of CPUs; 1 disables the pool.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(runs))
+
+    # Spawning workers (each importing pandas) only pays off for larger experiments
+    if workers <= 1 or len(runs) < PARALLEL_MIN_RUNS:
+        return [measure_run(run) for run in runs]
+
+    chunksize = max(1, len(runs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return list(executor.map(measure_run, runs, chunksize=chunksize))
+
+def measure_runs_cached(runs, workers=None, cache=None):
+    """
+    Like measure_runs, but only parses runs that are new or changed since they were cached.
+    """
+    if cache is None:
+        return measure_runs(runs, workers)
+
+    keys = [(run_source_files(run)[0], file_fingerprint(run_source_files(run))) for run in runs]
+    measurements = cache.get_many(keys)
+
+    # Entries cached before the end time was measured are parsed again
+    missing = [i for i, measurement in enumerate(measurements)
+               if measurement is None or any("End" not in task for task in measurement)]
+    print(f"Energy cache: {len(runs) - len(missing)} cached, {len(missing)} to parse")
+    computed = measure_runs([runs[i] for i in missing], workers)
+
+    new_entries = []
+    for i, measurement in zip(missing, computed):
+        measurements[i] = measurement
+        if measurement is not None:
+            new_entries.append((*keys[i], measurement))
+    cache.put_many(new_entries)
+
+    return measurements
+
+def summarize_runs(experiment_name, idle_samples, runs, workers=None, cache=None):
+    """
+    Build the summary rows of all runs, applying the idle compensation to every task.
+    idle_samples are (time, cpu_energy, duration) tuples; with several samples the idle power
+    is interpolated to the time each task finished.
+    """
+    data = []
+    for run, tasks in zip(runs, measure_runs_cached(runs, workers, cache)):
+        if tasks is not None:
+            data.extend(summary_rows(experiment_name, idle_samples, run, tasks))
+    return data
+
+def summary_rows(experiment_name, idle_samples, run, tasks):
+    """
+    Summary rows of the measured tasks of one run, with idle compensation.
+    """
+    _, run_folder, _ = run
+    rows = []
+    for task in tasks:
+        cpu_idle, run_time_idle = idle_energy_at(idle_samples, task["End"])
+        cpu_compensation = compute_idle_energy_compensation(task["CPU Energy"], task["Run Time"], cpu_idle, run_time_idle)
+        rows.append({
+            "Experiment": experiment_name,
+            "Task": task["Task"],
+            "Run": int(run_folder),
+            "CPU Energy": task["CPU Energy"],
+            "CPU Idle": cpu_idle,
+            "CPU Compensation": cpu_compensation,
+            "RAM Energy": task["RAM Energy"]
+        })
+    return rows
+
+def ingest_run(run_path, energies=None, end=None, store_path=DEFAULT_STORE_PATH, cache_path=DEFAULT_CACHE_PATH):
+    """
+    Publish a run as soon as it finished: its measurements go to the energy cache, so the
+    summary at the end of the experiment doesn't parse it again, and its summary rows to the
+    results store. energies is the (CPU energy, RAM energy, run time) integrated while the run
+    was measured and end the time (s) of its last sample; without them, or for a full build,
+    the trace is parsed here.
+    Returns the task measurements, or None if the run can't be read.
+    """
+    run = run_of_folder(run_path)
+    task_name = run[0]
+    if task_name is None or energies is None or end is None:
+        tasks = measure_run(run)
+    else:
+        ensure_trace(os.path.join(run_path, "results.csv"))
+        cpu, ram, run_time = energies
+        tasks = [{"Task": task_name, "CPU Energy": cpu, "RAM Energy": ram, "Run Time": run_time, "End": end}]
+    if tasks is None:
+        return None
+
+    if cache_path:
+        cache = EnergyCache(cache_path)
+        try:
+            files = run_source_files(run)
+            cache.put_many([(files[0], file_fingerprint(files), tasks)])
+        finally:
+            cache.close()
+
+    experiment_dir = os.path.dirname(os.path.dirname(run_path))
+    idle_samples = read_idle_samples(experiment_dir)
+    if idle_samples and tasks:
+        store = open_results_store(store_path)
+        try:
+            store.upsert(summary_rows(os.path.basename(experiment_dir), idle_samples, run, tasks))
+        finally:
+            store.close()
+    return tasks
+
+def extract_and_append_summary(latest_exp_path, store_path=DEFAULT_STORE_PATH, workers=None, cache_path=DEFAULT_CACHE_PATH):
     if not latest_exp_path:
         print("No experiment folders found.")
         return
 
     experiment_name = os.path.basename(latest_exp_path)
-    data = []
 
     print("extract_and_append_summary before for loop")
 
-    cpu_idle, run_time_idle = compute_cpu_energy_from_csv(os.path.join(latest_exp_path, "idle_consumption.csv"))
-
-    for task_folder in os.listdir(latest_exp_path):
-        task_path = os.path.join(latest_exp_path, task_folder)
-        if not os.path.isdir(task_path):
-            continue
-        task_name = task_folder.replace("_", ":")
+    idle_samples = read_idle_samples(latest_exp_path)
+    if not idle_samples:
+        # Experiments from before idle baselines were recorded
+        cpu_idle, run_time_idle = compute_cpu_energy_from_csv(os.path.join(latest_exp_path, "idle_consumption.csv"))
+        idle_samples = [(0, cpu_idle, run_time_idle)]
 
-        for run_folder in os.listdir(task_path):
-            run_path = os.path.join(task_path, run_folder)
-            csv_file = os.path.join(run_path, "results.csv")
-            if os.path.exists(csv_file):
-                try:
-                    #cpu = compute_cpu_energy_from_csv(csv_file)
-                    cpu, run_time = compute_cpu_energy_from_csv(csv_file)
-
-                    cpu_compensation = compute_idle_energy_compensation(cpu, run_time, cpu_idle, run_time_idle)
-                    ram = compute_ram_energy_from_csv(csv_file)
-
-                    run_number = int(run_folder)
-                    data.append({
-                        "Experiment": experiment_name,
-                        "Task": task_name,
-                        "Run": run_number,
-                        "CPU Energy": cpu,
-                        "CPU Idle": cpu_idle,
-                        "CPU Compensation": cpu_compensation,
-                        "RAM Energy": ram
-                    })
-                except Exception as e:
-                    print(f"Error reading {csv_file}: {e}")
+    runs = list_run_folders(latest_exp_path)
+    cache = EnergyCache(cache_path) if cache_path else None
+    try:
+        data = summarize_runs(experiment_name, idle_samples, runs, workers, cache)
+    finally:
+        if cache is not None:
+            cache.close()
 
     df = pd.DataFrame(data)
     if not df.empty:
-        if os.path.exists(summary_csv):
-            df.to_csv(summary_csv, mode='a', header=False, index=False)
-        else:
-            df.to_csv(summary_csv, index=False)
-        abs_summary_csv = os.path.abspath(summary_csv)
-        print(f"Appended {len(df)} rows to {abs_summary_csv}")
+        # Runs finish in arbitrary order, keep the summary deterministic
+        df = df.sort_values(["Task", "Run"], kind="stable", ignore_index=True)
+        store = open_results_store(store_path)
+        try:
+            # Runs ingested while the experiment ran are already stored
+            changed = store.changed(df)
+            count = store.upsert(changed) if not changed.empty else 0
+        finally:
+            store.close()
+        print(f"Stored {count} rows in {os.path.abspath(store_path)} ({len(df) - count} unchanged)")
     else:
         print("No valid results found in latest experiment.")
@@ -0,0 +1,111 @@
+# logic/idle_baseline.py
+
+import json
+import os
+import platform
+import socket
+import sqlite3
+import time
+
+DEFAULT_BASELINE_PATH = os.path.join("results", "idle_baselines.sqlite")
+DEFAULT_MAX_AGE = 3600           # seconds a stored baseline may be reused
+DEFAULT_SAMPLE_INTERVAL = 1800   # seconds between idle samples during an experiment
+IDLE_SAMPLES_FILE = "idle_samples.jsonl"
+IDLE_SAMPLES_DIR = "idle_samples"
+
+
+def host_id():
+    """
+    Identify the machine a baseline was measured on.
+    """
+    return f"{socket.gethostname()}/{platform.system()}/{platform.machine()}"
+
+
+class IdleBaselineStore:
+    """
+    Idle measurements per host, so back-to-back experiments can reuse a recent baseline
+    instead of measuring it again.
+    """
+
+    def __init__(self, path=DEFAULT_BASELINE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS baselines ("
+            "host TEXT NOT NULL, measured_at REAL NOT NULL, cpu_energy REAL NOT NULL, duration REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS baselines_host ON baselines (host, measured_at)")
+        self.connection.commit()
+
+    def record(self, host, measured_at, cpu_energy, duration):
+        self.connection.execute(
+            "INSERT INTO baselines (host, measured_at, cpu_energy, duration) VALUES (?, ?, ?, ?)",
+            (host, measured_at, cpu_energy, duration)
+        )
+        self.connection.commit()
+
+    def latest(self, host, max_age=DEFAULT_MAX_AGE):
+        """
+        The most recent (measured_at, cpu_energy, duration) of the host, or None if there is
+        none younger than max_age seconds.
+        """
+        return self.connection.execute(
+            "SELECT measured_at, cpu_energy, duration FROM baselines WHERE host = ? AND measured_at >= ? "
+            "ORDER BY measured_at DESC LIMIT 1",
+            (host, time.time() - max_age)
+        ).fetchone()
+
+    def close(self):
+        self.connection.close()
+
+
+def append_idle_sample(experiment_dir, measured_at, cpu_energy, duration, source):
+    """
+    Add an idle sample to the experiment. source is 'measured' or 'cached'.
+    """
+    with open(os.path.join(experiment_dir, IDLE_SAMPLES_FILE), "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "time": measured_at, "cpu_energy": cpu_energy, "duration": duration, "source": source, "host": host_id()
+        }) + "\n")
+
+
+def read_idle_samples(experiment_dir):
+    """
+    The (time, cpu_energy, duration) idle samples of an experiment, sorted by time.
+    """
+    path = os.path.join(experiment_dir, IDLE_SAMPLES_FILE)
+    if not os.path.exists(path):
+        return []
+    samples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            samples.append((record["time"], record["cpu_energy"], record["duration"]))
+    return sorted(samples)
+
+
+def idle_energy_at(samples, timestamp):
+    """
+    Idle energy and duration to compensate a run finished at timestamp with: the first sample,
+    scaled to the idle power interpolated between the samples taken before and after the run.
+    """
+    _, reference_energy, reference_duration = samples[0]
+    if len(samples) == 1:
+        return reference_energy, reference_duration
+
+    times = [sample[0] for sample in samples]
+    powers = [energy / duration for _, energy, duration in samples]
+    if timestamp <= times[0]:
+        power = powers[0]
+    elif timestamp >= times[-1]:
+        power = powers[-1]
+    else:
+        after = next(i for i, t in enumerate(times) if t >= timestamp)
+        fraction = (timestamp - times[after - 1]) / (times[after] - times[after - 1])
+        power = powers[after - 1] + fraction * (powers[after] - powers[after - 1])
+    return power * reference_duration, reference_duration
@@ -0,0 +1,93 @@
+# logic/journal.py
+
+import json
+import os
+
+JOURNAL_FILE = "journal.jsonl"
+
+
+class ExperimentJournal:
+    """
+    Write-ahead journal of an experiment directory: the configuration of the experiment and
+    every measurement unit (task, iteration) that was started and finished. Each record is
+    flushed to disk before the experiment moves on, so a crashed experiment can be resumed.
+    """
+
+    def __init__(self, experiment_dir):
+        self.path = os.path.join(experiment_dir, JOURNAL_FILE)
+        torn = False
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self.file = open(self.path, "a", encoding="utf-8")
+        if torn:
+            # End the line a crash left half-written, so it doesn't swallow the next record
+            self.file.write("\n")
+            self.file.flush()
+
+    def write(self, kind, **fields):
+        self.file.write(json.dumps({"type": kind, **fields}) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def write_config(self, config):
+        self.write("config", config=config)
+
+    def unit_started(self, task, iteration):
+        self.write("unit_started", task=task, iteration=iteration)
+
+    def unit_finished(self, task, iteration, returncode, energy):
+        self.write("unit_finished", task=task, iteration=iteration, returncode=returncode, energy=energy)
+
+    def close(self):
+        self.file.close()
+
+
+class JournalState:
+    """
+    What a journal says about an experiment: its configuration, whether idle consumption
+    was measured, the energy of each successfully finished (task, iteration) unit, the units
+    that failed and whether it completed. Failed units are not finished, so a resumed
+    experiment runs them again.
+    """
+
+    def __init__(self):
+        self.config = None
+        self.idle_measured = False
+        self.finished = {}
+        self.failed = set()
+        self.completed = False
+
+
+def read_journal(experiment_dir):
+    """
+    Replay the journal of an experiment directory. A torn last line, left by a crash
+    while writing, is ignored.
+    """
+    state = JournalState()
+    path = os.path.join(experiment_dir, JOURNAL_FILE)
+    if not os.path.exists(path):
+        return state
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            kind = record.get("type")
+            if kind == "config":
+                state.config = record["config"]
+            elif kind == "idle_measured":
+                state.idle_measured = True
+            elif kind == "unit_finished":
+                unit = (record["task"], record["iteration"])
+                if record.get("returncode") == 0:
+                    state.finished[unit] = record["energy"]
+                    state.failed.discard(unit)
+                else:
+                    state.failed.add(unit)
+            elif kind == "completed":
+                state.completed = True
+    return state
@@ -0,0 +1,193 @@
+# logic/live_ingest.py
+
+"""
+Streaming ingestion of EnergiBridge output: results.csv is tailed while the task runs and
+its energy is integrated sample by sample, so a run's energy is known the moment it ends.
+"""
+
+import csv
+import os
+import threading
+from array import array
+
+from logic.energibridge_csv import detect_schema, read_counter_ranges, wrapped_interval
+
+POLL_SECONDS = 1.0
+
+
+def _float32(value):
+    # read_energy_trace loads per-sample readings as float32, round the same way
+    return array("f", [value])[0]
+
+
+def counter_delta(previous, value, max_range=None):
+    """
+    Energy between two readings of a cumulative counter, handling a wraparound like counter_intervals.
+    """
+    return value - previous if value >= previous else wrapped_interval(previous - value, max_range)
+
+
+class TraceAccumulator:
+    """
+    Integrates EnergiBridge samples as they arrive, giving the same CPU energy, RAM energy
+    and run time as compute_energies on the complete trace.
+    """
+
+    def __init__(self, columns, counter_ranges=None):
+        self.schema = detect_schema(columns)
+        counter_ranges = counter_ranges or {}
+        self.cpu_range = counter_ranges.get(self.schema["cpu_energy"])
+        self.ram_range = counter_ranges.get(self.schema["ram_energy"])
+        if self.schema["cpu_energy"] is None and self.schema["cpu_power"] is None:
+            raise NotImplementedError("No CPU energy or power column found")
+        index = {column: i for i, column in enumerate(columns)}
+        self.time_index = index["Time"]
+        self.delta_index = index["Delta"]
+        self.cpu_index = index[self.schema["cpu_energy"] or self.schema["cpu_power"]]
+        self.ram_index = index[self.schema["ram_energy"]] if self.schema["ram_energy"] else None
+        self.samples = 0
+        self.first_time = self.last_time = None
+        self.last_cpu = self.last_ram = None
+        self.cpu_energy = 0.0
+        self.ram_energy = 0.0
+
+    def add(self, row):
+        timestamp = int(row[self.time_index])
+        cpu = float(row[self.cpu_index])
+        ram = float(row[self.ram_index]) if self.ram_index is not None else None
+        if self.schema["cpu_energy"] is None:
+            self.cpu_energy += _float32(cpu) * (_float32(float(row[self.delta_index])) / 1_000)
+        elif self.samples > 0:
+            self.cpu_energy += counter_delta(self.last_cpu, cpu, self.cpu_range)
+        if ram is not None and self.samples > 0:
+            self.ram_energy += counter_delta(self.last_ram, ram, self.ram_range)
+        if self.samples == 0:
+            self.first_time = timestamp
+        self.last_time, self.last_cpu, self.last_ram = timestamp, cpu, ram
+        self.samples += 1
+
+    def energies(self):
+        """
+        (CPU energy, RAM energy, run time) of the samples so far, or None before the first sample.
+        """
+        if self.samples == 0:
+            return None
+        cpu = self.cpu_energy
+        if self.schema["ram_energy"]:
+            ram = self.ram_energy
+        elif self.schema["used_memory"]:
+            ram = -1  # Mac does not have ram energy metric
+        else:
+            ram = None
+        return cpu, ram, (self.last_time - self.first_time) / 1_000
+
+
+class CsvTail:
+    """
+    Reads the complete lines appended to a file since the last call. The file may not exist
+    yet, and is read from the start again if it is truncated.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.partial = b""
+        self.restarted = False
+
+    def read_lines(self):
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < self.offset:
+                    self.offset, self.partial = 0, b""
+                    self.restarted = True
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        self.offset += len(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        return [line.decode("utf-8").rstrip("\r") for line in lines if line.strip()]
+
+
+class LiveIngester:
+    """
+    Tails an EnergiBridge results.csv from a background thread while the measured command runs.
+    on_progress(elapsed, power, cpu_energy, ram_energy) is called after every poll that read
+    new samples, with the mean CPU power in W since the previous one.
+    """
+
+    def __init__(self, csv_path, on_progress=None, poll_seconds=POLL_SECONDS):
+        self.tail = CsvTail(csv_path)
+        self.on_progress = on_progress
+        self.poll_seconds = poll_seconds
+        self.accumulator = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.lock = threading.Lock()
+        self.last_reading = None
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Read the rest of the trace once the measured command has exited.
+        Returns (CPU energy, RAM energy, run time), or None if no samples were read.
+        """
+        self.stop_event.set()
+        self.thread.join()
+        self.poll()
+        return self.energies()
+
+    def energies(self):
+        with self.lock:
+            return self.accumulator.energies() if self.accumulator is not None else None
+
+    def end_time(self):
+        """
+        Time (s since the epoch) of the last sample read, or None.
+        """
+        with self.lock:
+            if self.accumulator is None or self.accumulator.samples == 0:
+                return None
+            return self.accumulator.last_time / 1_000
+
+    def _run(self):
+        while not self.stop_event.wait(self.poll_seconds):
+            try:
+                if self.poll() and self.on_progress is not None:
+                    self._report()
+            except Exception as e:
+                print(f"Live ingestion of {self.tail.path} failed: {e}")
+                return
+
+    def poll(self):
+        """
+        Integrate the samples written since the last poll. Returns whether there were any.
+        """
+        lines = self.tail.read_lines()
+        if not lines:
+            return False
+        with self.lock:
+            if self.tail.restarted:
+                self.accumulator, self.last_reading = None, None
+                self.tail.restarted = False
+            for row in csv.reader(lines):
+                if self.accumulator is None:
+                    self.accumulator = TraceAccumulator(row, read_counter_ranges(self.tail.path))
+                else:
+                    self.accumulator.add(row)
+            return self.accumulator.samples > 0
+
+    def _report(self):
+        energies = self.energies()
+        if energies is None:
+            return
+        cpu, ram, elapsed = energies
+        power = None
+        if self.last_reading is not None and elapsed > self.last_reading[1]:
+            power = (cpu - self.last_reading[0]) / (elapsed - self.last_reading[1])
+        self.last_reading = (cpu, elapsed)
+        self.on_progress(elapsed, power, cpu, ram)
@@ -0,0 +1,187 @@
+# logic/rapl_sampler.py
+
+"""
+In-process alternative to EnergiBridge on Linux: a thread samples the RAPL energy counters
+under /sys/class/powercap while the measured command runs and writes an EnergiBridge-style
+results.csv, so the summary and the live ingestion read it like any other trace.
+"""
+
+import csv
+import glob
+import json
+import os
+import subprocess
+import threading
+import time
+
+from logic.cooldown import RAPL_ROOT, rapl_package_zones, read_zone
+
+DEFAULT_SAMPLE_INTERVAL = 0.1  # seconds
+PACKAGE_COLUMN = "PACKAGE_ENERGY (J)"
+DRAM_COLUMN = "DRAM_ENERGY (J)"
+COUNTER_RANGES_SUFFIX = ".ranges.json"
+
+
+def rapl_dram_zones(root=RAPL_ROOT):
+    """
+    The readable DRAM sub-zones (intel-rapl:N:M named "dram"), or an empty list.
+    """
+    zones = []
+    for zone in sorted(glob.glob(os.path.join(root, "intel-rapl:*:*"))):
+        try:
+            with open(os.path.join(zone, "name")) as f:
+                if f.read().strip() != "dram":
+                    continue
+            read_zone(zone, "energy_uj")
+            zones.append(zone)
+        except (OSError, ValueError):
+            pass
+    return zones
+
+
+def rapl_zone_ranges(root=RAPL_ROOT):
+    """
+    The ranges (J) after which the RAPL counters wrap around, one per zone, as
+    {"package": [...], "dram": [...]}. max_energy_range_uj is world-readable even where
+    the counters themselves are not, so this works for EnergiBridge measurements too.
+    """
+    ranges = {"package": [], "dram": []}
+    for zone in sorted(glob.glob(os.path.join(root, "intel-rapl:*"))):
+        try:
+            if os.path.basename(zone).count(":") == 1:
+                ranges["package"].append(read_zone(zone, "max_energy_range_uj") / 1e6)
+            else:
+                with open(os.path.join(zone, "name")) as f:
+                    if f.read().strip() == "dram":
+                        ranges["dram"].append(read_zone(zone, "max_energy_range_uj") / 1e6)
+        except (OSError, ValueError):
+            pass
+    return ranges
+
+
+def counter_ranges_path(csv_path):
+    return os.path.splitext(csv_path)[0] + COUNTER_RANGES_SUFFIX
+
+
+def record_counter_ranges(csv_path, root=RAPL_ROOT):
+    """
+    Store the RAPL zone ranges next to the trace csv_path is about to receive, so its
+    counters' wraparounds can be corrected later. Nothing is stored where RAPL is unavailable.
+    """
+    ranges = rapl_zone_ranges(root)
+    path = counter_ranges_path(csv_path)
+    if not ranges["package"] and not ranges["dram"]:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(ranges, f)
+
+
+def rapl_available(root=RAPL_ROOT):
+    """
+    Whether the package energy counters under root can be read by this user.
+    """
+    return bool(rapl_package_zones(root))
+
+
+class RaplCounter:
+    """
+    Cumulative energy in J of a set of RAPL zones since the counter was created,
+    corrected for each zone's counter wrapping around.
+    """
+
+    def __init__(self, zones):
+        self.zones = zones
+        self.ranges = [read_zone(zone, "max_energy_range_uj") for zone in zones]
+        self.last = [read_zone(zone, "energy_uj") for zone in zones]
+        self.total_uj = 0
+
+    def read(self):
+        for i, zone in enumerate(self.zones):
+            value = read_zone(zone, "energy_uj")
+            delta = value - self.last[i]
+            if delta < 0:
+                # A wraparound drops by nearly the whole range; anything less is a reset
+                delta = delta + self.ranges[i] if -delta > self.ranges[i] / 2 else 0
+            self.total_uj += delta
+            self.last[i] = value
+        return self.total_uj / 1e6
+
+
+class RaplSampler:
+    """
+    Writes a RAPL sample every `interval` seconds to output_file from a background thread,
+    with the Delta, Time (ms) and cumulative energy columns of an EnergiBridge CSV.
+    Use as a context manager around the measured code.
+    """
+
+    def __init__(self, output_file, interval=DEFAULT_SAMPLE_INTERVAL, root=RAPL_ROOT):
+        package_zones = rapl_package_zones(root)
+        if not package_zones:
+            raise OSError(f"No readable RAPL energy counters under {root}")
+        self.output_file = output_file
+        self.interval = interval
+        self.package = RaplCounter(package_zones)
+        dram_zones = rapl_dram_zones(root)
+        self.dram = RaplCounter(dram_zones) if dram_zones else None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.last_time = None
+        self.file = None
+        self.writer = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self.file = open(self.output_file, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["Delta", "Time", PACKAGE_COLUMN] + ([DRAM_COLUMN] if self.dram else []))
+        self.sample()
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.sample()  # the end of the measured command
+        self.file.close()
+
+    def sample(self):
+        now = time.time_ns() // 1_000_000
+        row = [now - self.last_time if self.last_time is not None else 0, now, self.package.read()]
+        if self.dram:
+            row.append(self.dram.read())
+        self.writer.writerow(row)
+        # Flushed on every sample so the live ingestion sees it
+        self.file.flush()
+        self.last_time = now
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except (OSError, ValueError) as e:
+                # The energy is cumulative, so a missed sample only lowers the resolution
+                print(f"Skipped a RAPL sample: {e}")
+
+
+def run_sampled(args, output_file, cwd=None, interval=DEFAULT_SAMPLE_INTERVAL, root=RAPL_ROOT):
+    """
+    Run a command (an argument list, without a shell) while sampling RAPL into output_file.
+    Returns the CompletedProcess with the captured output.
+    """
+    with RaplSampler(output_file, interval, root):
+        return subprocess.run(args, capture_output=True, text=True, cwd=cwd)
+
+
+def sample_idle(output_file, seconds, interval=DEFAULT_SAMPLE_INTERVAL, root=RAPL_ROOT):
+    """
+    Sample RAPL into output_file while doing nothing for the given number of seconds.
+    """
+    with RaplSampler(output_file, interval, root):
+        time.sleep(seconds)
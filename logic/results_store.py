@@ -0,0 +1,188 @@
+# logic/results_store.py
+
+import os
+import sqlite3
+import pandas as pd
+
+DEFAULT_STORE_PATH = os.path.join("results", "experiments.sqlite")
+LEGACY_SUMMARY_CSV = os.path.join("results", "all_experiments_summary.csv")
+
+SUMMARY_COLUMNS = ['Experiment', 'Task', 'Run', 'CPU Energy', 'CPU Idle', 'CPU Compensation', 'RAM Energy']
+
+# Summary column -> database column
+DB_COLUMNS = {
+    'Experiment': 'experiment',
+    'Task': 'task',
+    'Run': 'run',
+    'CPU Energy': 'cpu_energy',
+    'CPU Idle': 'cpu_idle',
+    'CPU Compensation': 'cpu_compensation',
+    'RAM Energy': 'ram_energy',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary (
+    experiment TEXT NOT NULL,
+    task TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    cpu_energy REAL,
+    cpu_idle REAL,
+    cpu_compensation REAL,
+    ram_energy REAL,
+    revision INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (experiment, task, run)
+);
+CREATE INDEX IF NOT EXISTS summary_task ON summary (task);
+CREATE INDEX IF NOT EXISTS summary_run ON summary (run);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY
+);
+"""
+
+
+class ResultsStore:
+    """
+    SQLite-backed store of experiment summaries, one row per (Experiment, Task, Run).
+    Uses WAL journaling so several processes can write while the GUI reads.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Autocommit mode, transactions are opened explicitly in _transaction()
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+        self.data_version = self._data_version()
+
+    def _migrate(self):
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(summary)")]
+        # Stores created before revisions were tracked
+        if "revision" not in columns:
+            self.connection.execute("ALTER TABLE summary ADD COLUMN revision INTEGER NOT NULL DEFAULT 1")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS summary_revision ON summary (revision)")
+
+    def _transaction(self, statements):
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                if callable(params):
+                    params = params(cursor)
+                cursor.executemany(sql, params)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def upsert(self, rows):
+        """
+        Insert summary rows (dicts or a DataFrame with SUMMARY_COLUMNS), replacing existing
+        rows of the same (Experiment, Task, Run). Returns the number of rows written.
+        """
+        if isinstance(rows, pd.DataFrame):
+            rows = rows.to_dict("records")
+        values = [tuple(self._db_value(row.get(col)) for col in SUMMARY_COLUMNS) for row in rows]
+        columns = ", ".join(DB_COLUMNS[col] for col in SUMMARY_COLUMNS)
+        updates = ", ".join(f"{DB_COLUMNS[col]} = excluded.{DB_COLUMNS[col]}" for col in SUMMARY_COLUMNS[3:])
+        sql = (f"INSERT INTO summary ({columns}, revision) VALUES ({', '.join('?' * (len(SUMMARY_COLUMNS) + 1))}) "
+               f"ON CONFLICT (experiment, task, run) DO UPDATE SET {updates}, revision = excluded.revision")
+
+        def with_revision(cursor):
+            # Every write gets a new revision, allocated inside the write lock so it is monotonic
+            revision = cursor.execute("SELECT COALESCE(MAX(revision), 0) + 1 FROM summary").fetchone()[0]
+            return [value + (revision,) for value in values]
+
+        self._transaction([(sql, with_revision)])
+        return len(values)
+
+    def changed(self, df):
+        """
+        The summary rows of df that are not in the store with the same values.
+        """
+        if df.empty:
+            return df
+        keys = SUMMARY_COLUMNS[:3]
+        stored = self.query(sorted(df["Experiment"].unique()))
+        merged = df.merge(stored, on=keys, how="left", suffixes=("", " stored"), indicator=True)
+        same = merged["_merge"] == "both"
+        for col in SUMMARY_COLUMNS[3:]:
+            new, old = merged[col].astype("float64"), merged[f"{col} stored"].astype("float64")
+            same &= (new == old) | (new.isna() & old.isna())
+        return df[~same.to_numpy()]
+
+    @staticmethod
+    def _db_value(value):
+        if value is None or (isinstance(value, float) and value != value):
+            return None
+        # numpy scalars are not understood by sqlite3
+        return value.item() if hasattr(value, "item") else value
+
+    def import_csv(self, csv_path):
+        """
+        Import an all_experiments_summary.csv file. Importing the same file again only
+        overwrites the rows it already wrote.
+        """
+        df = pd.read_csv(csv_path)
+        count = self.upsert(df) if not df.empty else 0
+        self._transaction([("INSERT OR IGNORE INTO imports (path) VALUES (?)", [(os.path.abspath(csv_path),)])])
+        return count
+
+    def has_imported(self, csv_path):
+        row = self.connection.execute("SELECT 1 FROM imports WHERE path = ?", (os.path.abspath(csv_path),)).fetchone()
+        return row is not None
+
+    def experiments(self):
+        rows = self.connection.execute("SELECT DISTINCT experiment FROM summary ORDER BY experiment").fetchall()
+        return [row[0] for row in rows]
+
+    def query(self, experiments=None):
+        """
+        Summary rows, optionally restricted to the given experiments.
+        """
+        columns = ", ".join(f'{DB_COLUMNS[col]} AS "{col}"' for col in SUMMARY_COLUMNS)
+        sql = f"SELECT {columns} FROM summary"
+        params = []
+        if experiments is not None:
+            sql += f" WHERE experiment IN ({', '.join('?' * len(experiments))})"
+            params = list(experiments)
+        return pd.read_sql_query(sql + " ORDER BY experiment, task, run", self.connection, params=params)
+
+    def changes_since(self, revision):
+        """
+        Rows inserted or updated after the given revision, with their "Revision" column.
+        """
+        columns = ", ".join(f'{DB_COLUMNS[col]} AS "{col}"' for col in SUMMARY_COLUMNS)
+        sql = f'SELECT {columns}, revision AS "Revision" FROM summary WHERE revision > ? ORDER BY revision'
+        return pd.read_sql_query(sql, self.connection, params=[revision])
+
+    def _data_version(self):
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def has_changed(self):
+        """
+        Whether another connection committed to the store since the last call. Cheap enough to poll.
+        """
+        data_version = self._data_version()
+        changed = data_version != self.data_version
+        self.data_version = data_version
+        return changed
+
+    def close(self):
+        self.connection.close()
+
+
+def open_results_store(path=DEFAULT_STORE_PATH, legacy_csv=LEGACY_SUMMARY_CSV):
+    """
+    Open the results store, importing the legacy summary CSV the first time it is seen.
+    """
+    store = ResultsStore(path)
+    if legacy_csv and os.path.exists(legacy_csv) and not store.has_imported(legacy_csv):
+        try:
+            count = store.import_csv(legacy_csv)
+            print(f"Imported {count} rows from {os.path.abspath(legacy_csv)} into {os.path.abspath(path)}")
+        except Exception as e:
+            print(f"Failed to import {legacy_csv}: {e}")
+    return store
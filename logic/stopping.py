@@ -0,0 +1,84 @@
+# logic/stopping.py
+
+import math
+from statistics import NormalDist, fmean, stdev
+
+DEFAULT_MIN_ITERATIONS = 10
+DEFAULT_CI_WIDTH = 0.05  # full width of the confidence interval relative to the mean
+DEFAULT_CONFIDENCE = 0.95
+
+
+# Up to this many degrees of freedom the quantile is computed from the exact distribution
+EXACT_T_MAX_DF = 30
+
+
+def t_two_sided(t, df):
+    """
+    P(|T| < t) for Student's t distribution with an integer number of degrees of freedom
+    (Abramowitz & Stegun 26.7.3 and 26.7.4).
+    """
+    theta = math.atan(t / math.sqrt(df))
+    cos2 = math.cos(theta) ** 2
+    if df % 2 == 0:
+        term, total = 1.0, 1.0
+        for k in range(2, df, 2):
+            term *= cos2 * (k - 1) / k
+            total += term
+        return math.sin(theta) * total
+    if df == 1:
+        return 2 * theta / math.pi
+    term, total = math.cos(theta), math.cos(theta)
+    for k in range(3, df, 2):
+        term *= cos2 * (k - 1) / k
+        total += term
+    return 2 / math.pi * (theta + math.sin(theta) * total)
+
+
+def t_quantile(p, df):
+    """
+    Quantile (p > 0.5) of Student's t distribution. Exact for up to EXACT_T_MAX_DF degrees of
+    freedom, where the Cornish-Fisher expansion around the normal quantile underestimates it;
+    beyond that the expansion is within 0.01% of the exact value.
+    """
+    if df <= EXACT_T_MAX_DF:
+        target = 2 * p - 1
+        low, high = 0.0, 1.0
+        while t_two_sided(high, df) < target:
+            low, high = high, high * 2
+        for _ in range(100):
+            middle = (low + high) / 2
+            if t_two_sided(middle, df) < target:
+                low = middle
+            else:
+                high = middle
+        return (low + high) / 2
+
+    z = NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z**3 + z) / (4 * df)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+        + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3)
+    )
+
+
+def relative_ci_width(values, confidence=DEFAULT_CONFIDENCE):
+    """
+    Width of the confidence interval of the mean of values, relative to the mean.
+    Infinite with fewer than two values or a zero mean.
+    """
+    if len(values) < 2:
+        return math.inf
+    mean = fmean(values)
+    if mean == 0:
+        return math.inf
+    half_width = t_quantile((1 + confidence) / 2, len(values) - 1) * stdev(values) / math.sqrt(len(values))
+    return 2 * half_width / abs(mean)
+
+
+def has_converged(values, min_iterations=DEFAULT_MIN_ITERATIONS, ci_width=DEFAULT_CI_WIDTH, confidence=DEFAULT_CONFIDENCE):
+    """
+    Whether enough runs were measured to stop: at least min_iterations and a confidence
+    interval of the mean narrower than ci_width relative to the mean.
+    """
+    return len(values) >= min_iterations and relative_ci_width(values, confidence) <= ci_width
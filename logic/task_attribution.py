@@ -0,0 +1,115 @@
+# logic/task_attribution.py
+
+import numpy as np
+import pandas as pd
+
+from logic.binary_trace import load_energy_trace
+from logic.energibridge_csv import counter_intervals, read_counter_ranges
+
+
+def load_task_timeline(timeline_path):
+    """
+    Load the Task,Start,End timeline written by the init script.
+    """
+    timeline = pd.read_csv(timeline_path)
+    timeline = timeline.dropna(subset=["Start", "End"])
+    return timeline.astype({"Start": "int64", "End": "int64"})
+
+
+def sample_interval_energy(df, energy_col=None, power_col=None, max_range=None):
+    """
+    Energy (J) consumed between consecutive samples, either from a cumulative energy counter
+    (corrected for wraparound with its max_range) or from a power column multiplied by the sample delta.
+    """
+    if energy_col is not None:
+        return counter_intervals(df[energy_col].to_numpy(dtype="float64"), max_range)
+    power = df[power_col].to_numpy(dtype="float64")[1:]
+    delta_seconds = np.diff(df["Time"].to_numpy(dtype="float64")) / 1_000
+    return power * delta_seconds
+
+
+def attribute_energy(times, interval_energy, starts, ends):
+    """
+    Split the energy of each sample interval across the tasks running during it.
+
+    times holds the N sample timestamps and interval_energy the N-1 energies between them.
+    Energy is assumed uniform within a sample interval; wherever several tasks overlap
+    (parallel execution) the energy of that slice is shared equally between them.
+    Returns the energy attributed to each task, in the order of starts/ends.
+    """
+    times = np.asarray(times, dtype="float64")
+    interval_energy = np.asarray(interval_energy, dtype="float64")
+    starts = np.clip(np.asarray(starts, dtype="float64"), times[0], times[-1])
+    ends = np.clip(np.asarray(ends, dtype="float64"), times[0], times[-1])
+
+    durations = np.diff(times)
+    rates = np.divide(interval_energy, durations, out=np.zeros_like(interval_energy), where=durations > 0)
+
+    breakpoints = np.unique(np.concatenate([times, starts, ends]))
+    lengths = np.diff(breakpoints)
+    midpoints = breakpoints[:-1] + lengths / 2
+
+    sample_idx = np.clip(np.searchsorted(times, midpoints, side="right") - 1, 0, len(rates) - 1)
+    active = (np.searchsorted(np.sort(starts), midpoints, side="right")
+              - np.searchsorted(np.sort(ends), midpoints, side="right"))
+
+    share = np.divide(rates[sample_idx] * lengths, active, out=np.zeros_like(lengths), where=active > 0)
+    cumulative = np.concatenate([[0.0], np.cumsum(share)])
+
+    return cumulative[np.searchsorted(breakpoints, ends)] - cumulative[np.searchsorted(breakpoints, starts)]
+
+
+def shared_run_times(starts, ends):
+    """
+    Each task's share of the wall-clock time, split like attribute_energy splits energy:
+    wherever several tasks overlap, the slice's time is shared equally between them.
+    Returns the times in the unit of starts/ends, in their order.
+    """
+    starts = np.asarray(starts, dtype="float64")
+    ends = np.asarray(ends, dtype="float64")
+    breakpoints = np.unique(np.concatenate([starts, ends]))
+    lengths = np.diff(breakpoints)
+    midpoints = breakpoints[:-1] + lengths / 2
+    active = (np.searchsorted(np.sort(starts), midpoints, side="right")
+              - np.searchsorted(np.sort(ends), midpoints, side="right"))
+
+    share = np.divide(lengths, active, out=np.zeros_like(lengths), where=active > 0)
+    cumulative = np.concatenate([[0.0], np.cumsum(share)])
+    return cumulative[np.searchsorted(breakpoints, ends)] - cumulative[np.searchsorted(breakpoints, starts)]
+
+
+def attribute_csv_to_tasks(csv_path, timeline_path, convert=False):
+    """
+    Attribute the CPU and RAM energy of a single full-build EnergiBridge trace to Gradle tasks.
+    Returns one dict per task with its energy and its share of the run time (s), so the idle
+    compensation of overlapping tasks doesn't count the overlap once per task.
+    convert is passed to load_energy_trace.
+    """
+    df, schema = load_energy_trace(csv_path, convert)
+    counter_ranges = read_counter_ranges(csv_path)
+    timeline = load_task_timeline(timeline_path)
+    if len(df) < 2 or timeline.empty:
+        return []
+
+    if schema["cpu_energy"]:
+        cpu_intervals = sample_interval_energy(df, energy_col=schema["cpu_energy"],
+                                               max_range=counter_ranges.get(schema["cpu_energy"]))
+    else:
+        cpu_intervals = sample_interval_energy(df, power_col=schema["cpu_power"])
+
+    times = df["Time"].to_numpy(dtype="float64")
+    starts = timeline["Start"].to_numpy()
+    ends = timeline["End"].to_numpy()
+
+    cpu = attribute_energy(times, cpu_intervals, starts, ends)
+    if schema["ram_energy"]:
+        ram = attribute_energy(times, sample_interval_energy(df, energy_col=schema["ram_energy"],
+                                                                max_range=counter_ranges.get(schema["ram_energy"])), starts, ends)
+    else:
+        ram = np.full(len(timeline), -1.0)  # Mac does not have ram energy metric
+
+    run_times = shared_run_times(starts, ends) / 1_000
+    return [
+        {"Task": task, "CPU Energy": float(c), "RAM Energy": float(r), "Run Time": float(t), "End": float(end) / 1_000}
+        for task, c, r, t, end in zip(timeline["Task"], cpu, ram, run_times, ends)
+    ]
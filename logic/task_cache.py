@@ -0,0 +1,111 @@
+# logic/task_cache.py
+
+import os
+import hashlib
+import json
+import sqlite3
+import time
+
+DEFAULT_TASK_CACHE_PATH = os.path.join("results", "task_cache.sqlite")
+
+# Files whose content determines the task graph of a Gradle build:
+# settings/build scripts, script plugins, gradle.properties and version catalogs
+BUILD_FILE_SUFFIXES = (".gradle", ".gradle.kts", "gradle.properties", ".versions.toml")
+# Directories that never contain build scripts but can be huge.
+# Sources are only searched in buildSrc, where convention plugins live.
+SKIPPED_DIRS = {"build", "node_modules", "experiment_results", "out"}
+
+
+def build_files(gradle_root):
+    """
+    Find the settings/build scripts and gradle.properties files of a Gradle build, sorted by path.
+    """
+    found = []
+    for dirpath, dirnames, filenames in os.walk(gradle_root):
+        in_build_src = "buildSrc" in os.path.relpath(dirpath, gradle_root).split(os.sep)
+        dirnames[:] = [
+            d for d in dirnames
+            if d not in SKIPPED_DIRS and not d.startswith(".") and (d != "src" or in_build_src)
+        ]
+        found.extend(os.path.join(dirpath, name) for name in filenames if name.endswith(BUILD_FILE_SUFFIXES))
+    return sorted(found)
+
+
+def build_fingerprint(gradle_root):
+    """
+    Hash the relative paths and contents of all build files of a Gradle build.
+    """
+    digest = hashlib.sha256()
+    for path in build_files(gradle_root):
+        digest.update(os.path.relpath(path, gradle_root).encode())
+        digest.update(b"\0")
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+class TaskCache:
+    """
+    Persistent cache of discovered Gradle tasks, keyed by (Gradle root, project directory
+    relative to the root, command) and invalidated when the fingerprint of the build files changes.
+    """
+
+    def __init__(self, path=DEFAULT_TASK_CACHE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(tasks)")]
+        if columns and "project" not in columns:
+            # Entries of caches keyed by the root alone may belong to any subproject; rediscover them
+            self.connection.execute("DROP TABLE tasks")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "root TEXT NOT NULL, project TEXT NOT NULL, command TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+            "tasks TEXT NOT NULL, discovered REAL NOT NULL, PRIMARY KEY (root, project, command))"
+        )
+        self.connection.commit()
+
+    def get(self, root, project, command, fingerprint):
+        """
+        The cached task list, or None if it is missing or the build files changed.
+        """
+        row = self.connection.execute(
+            "SELECT fingerprint, tasks FROM tasks WHERE root = ? AND project = ? AND command = ?",
+            (os.path.abspath(root), project, command.strip())
+        ).fetchone()
+        if row is None or row[0] != fingerprint:
+            return None
+        return json.loads(row[1])
+
+    def put(self, root, project, command, fingerprint, tasks):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO tasks (root, project, command, fingerprint, tasks, discovered) VALUES (?, ?, ?, ?, ?, ?)",
+            (os.path.abspath(root), project, command.strip(), fingerprint, json.dumps(tasks), time.time())
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def get_cached_tasks(gradle_root, cmd, discover, cache_path=DEFAULT_TASK_CACHE_PATH, refresh=False, project_dir=None):
+    """
+    Return the tasks `gradle <cmd>` would run in project_dir (default: gradle_root), calling
+    discover(cmd) only if they are not cached for the current build files of gradle_root or
+    refresh is set. Failed discoveries (no tasks found) are not cached.
+    """
+    project = os.path.relpath(os.path.abspath(project_dir or gradle_root), os.path.abspath(gradle_root))
+    fingerprint = build_fingerprint(gradle_root)
+    cache = TaskCache(cache_path)
+    try:
+        tasks = None if refresh else cache.get(gradle_root, project, cmd, fingerprint)
+        if tasks is not None:
+            print(f"Using cached tasks for '{cmd}' in {project_dir or gradle_root}")
+            return tasks
+        tasks = discover(cmd)
+        if tasks:
+            cache.put(gradle_root, project, cmd, fingerprint, tasks)
+        return tasks
+    finally:
+        cache.close()
@@ -0,0 +1,40 @@
+# logic/task_timeline.py
+
+import os
+
+FULL_BUILD_DIR = "full_build"
+TASK_TIMELINE_FILE = "task_timeline.csv"
+INIT_SCRIPT_FILE = "task_timeline.init.gradle"
+
+# Gradle init script recording the wall-clock start/end (epoch ms) of every executed task.
+# EnergiBridge's "Time" column uses the same clock, so both streams can be aligned directly.
+INIT_SCRIPT_TEMPLATE = """import java.util.concurrent.ConcurrentHashMap
+
+def timelineFile = new File('{timeline_path}')
+def starts = new ConcurrentHashMap<String, Long>()
+timelineFile.text = "Task,Start,End\\n"
+
+gradle.taskGraph.beforeTask {{ Task task ->
+    starts[task.path] = System.currentTimeMillis()
+}}
+
+gradle.taskGraph.afterTask {{ Task task ->
+    long end = System.currentTimeMillis()
+    synchronized (timelineFile) {{
+        timelineFile << "${{task.path}},${{starts[task.path]}},${{end}}\\n"
+    }}
+}}
+"""
+
+
+def write_timeline_init_script(output_dir):
+    """
+    Write the Gradle init script that records per-task timestamps into output_dir.
+    Returns the absolute path of the init script, as Gradle runs in the Gradle root.
+    """
+    timeline_path = os.path.abspath(os.path.join(output_dir, TASK_TIMELINE_FILE))
+    init_script_path = os.path.join(output_dir, INIT_SCRIPT_FILE)
+    with open(init_script_path, "w") as f:
+        # Groovy accepts forward slashes on every platform
+        f.write(INIT_SCRIPT_TEMPLATE.format(timeline_path=timeline_path.replace("\\", "/")))
+    return os.path.abspath(init_script_path)
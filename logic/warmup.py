@@ -0,0 +1,100 @@
+# logic/warmup.py
+
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_MIN_DURATION = 60
+DEFAULT_MAX_DURATION = 300
+WINDOW_SECONDS = 5
+PLATEAU_WINDOWS = 4       # readings that must agree
+PLATEAU_TOLERANCE = 0.03  # relative spread of those readings
+THERMAL_ROOT = "/sys/class/thermal"
+
+
+def fibonacci(n):
+    if n <= 1:
+        return n
+    return fibonacci(n-1) + fibonacci(n-2)
+
+
+def burn(seconds):
+    """
+    Keep one core busy with Fibonacci numbers for the given time. Returns the number of calculations.
+    """
+    end_time = time.monotonic() + seconds
+    iterations = 0
+    while time.monotonic() < end_time:
+        fibonacci(iterations % 25)
+        iterations += 1
+    return iterations
+
+
+def package_temperature(root=THERMAL_ROOT):
+    """
+    CPU package temperature in °C (the hottest zone if there is no package sensor), or None.
+    """
+    temperatures = {}
+    for zone in glob.glob(os.path.join(root, "thermal_zone*")):
+        try:
+            with open(os.path.join(zone, "type")) as f:
+                kind = f.read().strip()
+            with open(os.path.join(zone, "temp")) as f:
+                temperatures.setdefault(kind, []).append(int(f.read()) / 1000)
+        except (OSError, ValueError):
+            pass
+    if "x86_pkg_temp" in temperatures:
+        return max(temperatures["x86_pkg_temp"])
+    return max((t for values in temperatures.values() for t in values), default=None)
+
+
+def has_plateaued(readings, windows=PLATEAU_WINDOWS, tolerance=PLATEAU_TOLERANCE):
+    """
+    Whether the last `windows` readings differ by at most tolerance relative to their mean.
+    """
+    recent = [r for r in readings[-windows:] if r is not None]
+    if len(recent) < windows:
+        return False
+    mean = sum(recent) / len(recent)
+    return mean > 0 and (max(recent) - min(recent)) / mean <= tolerance
+
+
+def run_warmup(measure_power=None, cores=None, min_duration=DEFAULT_MIN_DURATION, max_duration=DEFAULT_MAX_DURATION,
+               window=WINDOW_SECONDS, on_progress=None):
+    """
+    Load `cores` cores (all by default) until package power and temperature plateau, but at least
+    min_duration and at most max_duration seconds. Without any readings it runs for max_duration.
+    measure_power(seconds) blocks for that long and returns the mean power in W, or None.
+    on_progress(elapsed, power, temperature) is called after every window.
+    Returns (duration, whether the readings plateaued, last power, last temperature).
+    """
+    cores = cores or os.cpu_count() or 1
+    min_duration = min(min_duration, max_duration)
+    powers, temperatures = [], []
+    plateaued = False
+    start = time.monotonic()
+
+    with ProcessPoolExecutor(max_workers=cores, mp_context=multiprocessing.get_context("spawn")) as pool:
+        while True:
+            seconds = min(window, max_duration - (time.monotonic() - start))
+            if seconds <= 0:
+                break
+            futures = [pool.submit(burn, seconds) for _ in range(cores)]
+            if measure_power is not None:
+                powers.append(measure_power(seconds))
+            for future in futures:
+                future.result()
+            temperatures.append(package_temperature())
+
+            elapsed = time.monotonic() - start
+            if on_progress is not None:
+                on_progress(elapsed, powers[-1] if powers else None, temperatures[-1])
+
+            signals = [readings for readings in (powers, temperatures) if any(r is not None for r in readings)]
+            plateaued = bool(signals) and all(has_plateaued(readings) for readings in signals)
+            if elapsed >= min_duration and plateaued:
+                break
+
+    return time.monotonic() - start, plateaued, powers[-1] if powers else None, temperatures[-1] if temperatures else None
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from logic.energibridge_csv import compute_energies, counter_intervals, detect_schema, read_counter_ranges
+from logic.live_ingest import TraceAccumulator
+from logic.rapl_sampler import counter_ranges_path
+
+RANGE = 262143.328850  # max_energy_range_uj of a typical Intel package, in J
+
+
+def wrapping_counter(intervals, start, max_range):
+    """
+    Readings of a counter starting at start that accumulates the given intervals and wraps at max_range.
+    """
+    return np.concatenate([[start], start + np.cumsum(intervals)]) % max_range
+
+
+class CounterIntervalsTest(unittest.TestCase):
+
+    def test_no_wrap(self):
+        values = [100.0, 110.0, 125.0, 130.0]
+        np.testing.assert_allclose(counter_intervals(values), [10, 15, 5])
+        np.testing.assert_allclose(counter_intervals(values, RANGE), [10, 15, 5])
+
+    def test_single_zone_wrap(self):
+        intervals = np.full(10, 30.0)
+        values = wrapping_counter(intervals, RANGE - 100, RANGE)
+        np.testing.assert_allclose(counter_intervals(values, RANGE), intervals)
+
+    def test_multi_zone_wrap(self):
+        # The column is the sum of two packages; only the second one wraps
+        first = wrapping_counter(np.full(10, 20.0), 60_000, RANGE)
+        second = wrapping_counter(np.full(10, 25.0), RANGE - 60, RANGE)
+        values = first + second
+        np.testing.assert_allclose(counter_intervals(values, [RANGE, RANGE]), np.full(10, 45.0))
+
+    def test_zones_with_different_ranges(self):
+        small = RANGE / 4
+        first = wrapping_counter(np.full(6, 10.0), small - 25, small)
+        second = wrapping_counter(np.full(6, 10.0), 1_000, RANGE)
+        np.testing.assert_allclose(counter_intervals(first + second, [RANGE, small]), np.full(6, 20.0))
+
+    def test_small_drop_is_not_a_wrap(self):
+        # Jitter or a reset of the counter, not a wraparound
+        values = [1_000.0, 1_010.0, 1_009.5, 1_020.0, 5.0, 15.0]
+        np.testing.assert_allclose(counter_intervals(values, RANGE), [10, 0, 10.5, 0, 10])
+
+    def test_unknown_range(self):
+        values = [RANGE - 10, RANGE - 5, 20.0, 30.0]
+        np.testing.assert_allclose(counter_intervals(values), [5, 0, 10])
+
+
+class ComputeEnergiesTest(unittest.TestCase):
+
+    def trace(self):
+        cpu = wrapping_counter(np.full(20, 50.0), RANGE - 500, RANGE)
+        ram = wrapping_counter(np.full(20, 5.0), 1_000, RANGE)
+        return pd.DataFrame({
+            "Delta": np.r_[0, np.full(20, 200)], "Time": 1_000 + np.arange(21) * 200,
+            "PACKAGE_ENERGY (J)": cpu, "DRAM_ENERGY (J)": ram,
+        })
+
+    def test_ranges_from_sidecar(self):
+        df = self.trace()
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "results.csv")
+            df.to_csv(csv_path, index=False)
+            with open(counter_ranges_path(csv_path), "w") as f:
+                f.write('{"package": [%r], "dram": [%r]}' % (RANGE, RANGE))
+            ranges = read_counter_ranges(csv_path)
+
+        cpu, ram, run_time = compute_energies(df, detect_schema(df.columns), ranges)
+        self.assertAlmostEqual(cpu, 1_000.0, places=6)
+        self.assertAlmostEqual(ram, 100.0, places=6)
+        self.assertEqual(run_time, 4.0)
+
+    def test_live_accumulator_matches(self):
+        df = self.trace()
+        ranges = {"PACKAGE_ENERGY (J)": [RANGE], "DRAM_ENERGY (J)": [RANGE]}
+        accumulator = TraceAccumulator(list(df.columns), ranges)
+        for row in df.itertuples(index=False):
+            accumulator.add([str(value) for value in row])
+        cpu, ram, _ = accumulator.energies()
+        expected_cpu, expected_ram, _ = compute_energies(df, detect_schema(df.columns), ranges)
+        self.assertAlmostEqual(cpu, expected_cpu, places=6)
+        self.assertAlmostEqual(ram, expected_ram, places=6)
+
+    def test_missing_sidecar(self):
+        self.assertEqual(read_counter_ranges(os.path.join(tempfile.gettempdir(), "missing", "results.csv")), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
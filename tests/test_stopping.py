@@ -0,0 +1,45 @@
+import math
+import unittest
+
+from logic.stopping import has_converged, relative_ci_width, t_quantile
+
+# Two-sided 95% and 99% critical values of Student's t distribution
+T_TABLE = {
+    (0.975, 1): 12.7062, (0.975, 2): 4.3027, (0.975, 3): 3.1824, (0.975, 4): 2.7764,
+    (0.975, 9): 2.2622, (0.975, 29): 2.0452, (0.975, 30): 2.0423, (0.975, 60): 2.0003,
+    (0.995, 1): 63.6567, (0.995, 2): 9.9248, (0.995, 3): 5.8409, (0.995, 10): 3.1693,
+    (0.995, 40): 2.7045, (0.95, 5): 2.0150,
+}
+
+
+class TQuantileTest(unittest.TestCase):
+
+    def test_known_values(self):
+        for (p, df), expected in T_TABLE.items():
+            with self.subTest(p=p, df=df):
+                self.assertAlmostEqual(t_quantile(p, df), expected, delta=1e-4 * expected)
+
+    def test_never_below_table_for_small_samples(self):
+        # An underestimate would stop adaptive iterations on a too narrow interval
+        for (p, df), expected in T_TABLE.items():
+            if df <= 4:
+                self.assertGreaterEqual(round(t_quantile(p, df), 4), expected)
+
+
+class ConvergenceTest(unittest.TestCase):
+
+    def test_ci_width(self):
+        values = [10.0, 12.0]
+        # mean 11, standard deviation sqrt(2), 95% half-width 12.706 * sqrt(2) / sqrt(2)
+        self.assertAlmostEqual(relative_ci_width(values), 2 * 12.7062 / 11, places=3)
+        self.assertEqual(relative_ci_width([10.0]), math.inf)
+
+    def test_has_converged(self):
+        stable = [100.0, 100.5, 99.5, 100.2, 99.8] * 2
+        self.assertTrue(has_converged(stable, min_iterations=10))
+        self.assertFalse(has_converged(stable[:9], min_iterations=10))
+        self.assertFalse(has_converged([100.0, 100.5, 99.5], min_iterations=2, ci_width=0.01))
+
+
+if __name__ == "__main__":
+    unittest.main()
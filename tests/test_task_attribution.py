@@ -0,0 +1,28 @@
+import unittest
+
+import numpy as np
+
+from logic.experiment_summary import compute_idle_energy_compensation
+from logic.task_attribution import attribute_energy, shared_run_times
+
+
+class SharedRunTimesTest(unittest.TestCase):
+
+    def test_sequential_tasks(self):
+        np.testing.assert_allclose(shared_run_times([0, 10], [10, 25]), [10, 15])
+
+    def test_overlapping_tasks(self):
+        # 0-5 alone, 5-10 shared, 10-20 alone
+        np.testing.assert_allclose(shared_run_times([0, 5], [10, 20]), [7.5, 12.5])
+
+    def test_parallel_tasks_idle_compensation(self):
+        # Two 20 W tasks in parallel for 10 s on a machine idling at 5 W
+        times = np.arange(0, 11, 1.0)
+        energy = attribute_energy(times, np.full(10, 40.0), [0, 0], [10, 10])
+        run_times = shared_run_times([0, 0], [10, 10])
+        compensated = [compute_idle_energy_compensation(e, t, 50.0, 10.0) for e, t in zip(energy, run_times)]
+        self.assertAlmostEqual(sum(compensated), 400.0 - 50.0)
+
+
+if __name__ == "__main__":
+    unittest.main()